@@ -8,14 +8,103 @@ import argparse
 import csv
 import json
 import logging
+import sys
 
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
 from pathlib import Path
 
 from nacc_form_validator.quality_check import QualityCheck
 
-logging.basicConfig(level=logging.DEBUG)
+# orjson is a lot faster for large rules files/error outputs, but is optional
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 log = logging.getLogger(__name__)
 
+# quality check object used by each worker process, set by init_worker
+worker_qc = None
+
+
+def load_json(fh):
+    """ Load JSON from the file, with orjson if it's installed """
+    if orjson:
+        return orjson.loads(fh.read())
+    return json.load(fh)
+
+
+def dump_json(obj):
+    """ Serialize to an indented JSON string, with orjson if it's installed """
+    if orjson:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+    return json.dumps(obj, indent=2, ensure_ascii=False)
+
+
+def intern_keys(obj):
+    """
+    Recursively intern the keys of the rules, so looking up a rule or a field the validator reads from
+    the record (whose keys are also interned) can match on identity before comparing the strings.
+    """
+    if isinstance(obj, dict):
+        return {sys.intern(key): intern_keys(value) for key, value in obj.items()}
+    if isinstance(obj, list):
+        return [intern_keys(value) for value in obj]
+    return obj
+
+
+def create_quality_check(rules, strict):
+    """
+    Instantiate the quality check object from rules JSON. This script assumes no datastore, and therefor
+    no plausibility checks (and no need for `pk_name`, so a dummy one is provided).
+    If you need one, you'll need to create and instantiate it before creating the QualityControl, and
+    update the script to pass in a primary key.
+    """
+    # using a dummy primary key
+    qc = QualityCheck("primary_key", intern_keys(rules), strict=strict)
+
+    # compile the rules once so records passing them skip the full validator,
+    # validate_records would otherwise do this on the first batch
+    if not qc.compile():
+        log.debug("Rules contain custom NACC rules, validating every record in full")
+
+    return qc
+
+
+def init_worker(rules, strict):
+    """ Create the quality check object once per worker process """
+    global worker_qc
+    worker_qc = create_quality_check(rules, strict)
+
+
+def validate_chunk(chunk):
+    """ Validate a chunk of records in a worker process, only keeps what is picklable and needed for the output """
+    return [(passed, errors) for passed, _, errors, _ in worker_qc.validate_records(chunk)]
+
+
+def validate_chunks(chunks, rules, strict, workers):
+    """
+    Validate the chunks of records, yielding the (passed, errors) results of each chunk in order.
+    With more than one worker, chunks are validated in parallel with at most 2 chunks per worker
+    in flight at a time so the whole file is never read into memory.
+    """
+    if workers == 1:
+        init_worker(rules, strict)
+        yield from map(validate_chunk, chunks)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=(rules, strict)) as executor:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(executor.submit(validate_chunk, chunk))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+
+        while pending:
+            yield pending.popleft().result()
+
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
@@ -29,14 +118,34 @@ if __name__ == "__main__":
                         help='The output CSV or JSON to write errors to. If not provided, results will just be written to stdout')
     parser.add_argument('-s', '--disable-strict', dest="disable_strict", action="store_true", default=False,
                         help='Disable strict mode - validator will skip unknown forms/fields')
+    parser.add_argument('-c', '--chunk-size', dest="chunk_size", type=int, default=100_000,
+                        help='Number of records to read and validate at a time; output is flushed after each chunk')
+    parser.add_argument('-b', '--buffer-size', dest="buffer_size", type=int, default=1 << 20,
+                        help='Size in bytes of the read/write buffers for the input CSV and output file, defaults to 1 MiB')
+    parser.add_argument('-v', '--verbose', dest="verbose", action="store_true", default=False,
+                        help='Enable debug logging')
+    parser.add_argument('-w', '--workers', dest="workers", type=int, default=1,
+                        help='Number of processes to validate chunks of records in parallel, defaults to 1 (validates in this process)')
 
     args = parser.parse_args()
 
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.INFO)
+
     log.info("Arguments:")
     log.info(f"rules_json:\t{args.rules_json}")
     log.info(f"input_records_csv:\t{args.input_records_csv}")
     log.info(f"output_errors:\t{args.output_errors}")
     log.info(f"strict mode::\t{not args.disable_strict}")
+    log.info(f"chunk_size:\t{args.chunk_size}")
+    log.info(f"workers:\t{args.workers}")
+    log.info(f"buffer_size:\t{args.buffer_size}")
+
+    if args.chunk_size < 1:
+        raise ValueError(f"Chunk size must be a positive integer: {args.chunk_size}")
+    if args.buffer_size < 1:
+        raise ValueError(f"Buffer size must be a positive integer: {args.buffer_size}")
+    if args.workers < 1:
+        raise ValueError(f"Number of workers must be a positive integer: {args.workers}")
 
     if not args.rules_json.is_file():
         raise FileNotFoundError(
@@ -45,66 +154,79 @@ if __name__ == "__main__":
         raise FileNotFoundError(
             f"Cannot find specified input records CSV: {args.input_records_csv}")
 
-    """
-    Instantiate the quality check object from rules JSON. This script assumes no datastore, and therefor
-    no plausibility checks (and no need for `pk_name`, so a dummy one is provided).
-    If you need one, you'll need to create and instantiate it before creating the QualityControl, and
-    update the script to pass in a primary key.
-    """
     rules = None
-    with args.rules_json.open('r') as fh:
-        rules = json.load(fh)
+    with args.rules_json.open('rb') as fh:
+        rules = load_json(fh)
 
-    # using a dummy primary key
-    qc = QualityCheck("primary_key", rules, strict=not args.disable_strict)
-
-    """
-    Validate records, and collect all the errors
     """
-    all_errors = []
-    error_headers = set(['row'])
-    with args.input_records_csv.open('r') as fh:
-        reader = csv.DictReader(fh)
-
-        # start at "row 1" since ignoring headers
-        for i, record in enumerate(reader, 1):
-            passed, _, errors, _ = qc.validate_record(record)
-            if not passed:
-                errors['row'] = i
-                all_errors.append(errors)
-                error_headers.update(set(errors.keys()))
-                log.warning(
-                    f"Row {i} in the input records CSV failed validation")
-
+    Validate records and stream the errors out as they are found
     """
-    Convert all_errors and error_headers to a "csv-like" dict for writing/printing out
-    """
-    for error in all_errors:
-        for header in error_headers:
-            if header not in error:
-                error[header] = ''
-
-    # sort but make sure row is first
-    error_headers = list(error_headers)
-    error_headers.sort()
-    error_headers.insert(0, error_headers.pop(error_headers.index('row')))
-
-    if args.output_errors:
-        suffix = args.output_errors.suffix
-        if suffix == ".json":
-            with args.output_errors.open('w') as outfh:
-                errors_json = {error.pop('row'): error for error in all_errors}
-                json.dump(errors_json, outfh, indent=4)
-        elif suffix in ['.csv', '']:
-            with args.output_errors.open('w') as outfh:
-                writer = csv.DictWriter(outfh, error_headers)
+    num_failed = 0
+    with args.input_records_csv.open('r', buffering=args.buffer_size, newline='') as fh:
+        reader = csv.reader(fh)
+        fieldnames = [sys.intern(field) for field in next(reader, [])]
+
+        # build a plain dict per row (skipping blank lines like csv.DictReader),
+        # without DictReader's per row bookkeeping
+        records = (dict(zip(fieldnames, row)) for row in reader if row)
+
+        # errors are keyed by either a schema field or a record field, so the
+        # full set of headers is known before validating any records
+        # sort but make sure row is first
+        error_headers = set(rules.keys()).union(fieldnames)
+        error_headers.discard('row')
+        error_headers = ['row'] + sorted(error_headers)
+
+        outfh = None
+        writer = None
+        suffix = None
+        if args.output_errors:
+            suffix = args.output_errors.suffix
+            if suffix not in ['.json', '.csv', '']:
+                raise ValueError(f"Unsupported output suffix: {suffix}")
+
+            outfh = args.output_errors.open('w', buffering=args.buffer_size, newline='')
+            if suffix == ".json":
+                outfh.write("{")
+            else:
+                # raise on errors keyed outside the headers rather than
+                # dropping them from the report
+                writer = csv.DictWriter(outfh, error_headers,
+                                        extrasaction='raise', restval='')
                 writer.writeheader()
-                writer.writerows(all_errors)
         else:
-            raise ValueError(f"Unsupported output suffix: {suffix}")
-    else:
-        log.info(f"The following rows failed validation: ")
-        for error in all_errors:
-            print(f"Row {error.pop('row')}: {json.dumps(error, indent=4)}")
-
-    log.info(f"{len(all_errors)} records failed validation")
+            log.info(f"The following rows failed validation: ")
+
+        try:
+            # start at "row 1" since ignoring headers
+            i = 0
+            chunks = iter(lambda: list(islice(records, args.chunk_size)), [])
+            for results in validate_chunks(chunks, rules, not args.disable_strict, args.workers):
+                for passed, errors in results:
+                    i += 1
+                    if passed:
+                        continue
+
+                    log.warning("Row %d in the input records CSV failed validation", i)
+
+                    if writer:
+                        writer.writerow({**errors, 'row': i})
+                    elif outfh:
+                        separator = "," if num_failed else ""
+                        outfh.write(f"{separator}\n  {dump_json(str(i))}: ")
+                        outfh.write(dump_json(errors).replace("\n", "\n  "))
+                    else:
+                        print(f"Row {i}: {dump_json(errors)}")
+
+                    num_failed += 1
+
+                if outfh:
+                    outfh.flush()
+                log.info("Validated %d records", i)
+        finally:
+            if outfh:
+                if suffix == ".json":
+                    outfh.write("\n}" if num_failed else "}")
+                outfh.close()
+
+    log.info(f"{num_failed} records failed validation")
@@ -1,10 +1,27 @@
 """Datastore module."""
 
 from abc import ABC, abstractmethod
-from typing import Dict, List, Optional
+from typing import Dict, Hashable, Iterable, List, Optional, Set, Tuple
 
 # pylint: disable=(too-few-public-methods, no-self-use, unused-argument)
 
+# Maximum number of drug ID/ADCID check results cached by a datastore
+CHECK_CACHE_SIZE = 4096
+
+
+def _cache_result(cache: Dict[Hashable, bool], key: Hashable, valid: bool):
+    """Store a check result, dropping the oldest entry when the cache is
+    full.
+
+    Args:
+        cache: Cache of the check results
+        key: Checked ID
+        valid: Check result
+    """
+    if len(cache) >= CHECK_CACHE_SIZE:
+        del cache[next(iter(cache))]
+    cache[key] = valid
+
 
 class Datastore(ABC):
     """Abstract class to represent the datastore (or warehouse) where previous
@@ -17,26 +34,98 @@ class Datastore(ABC):
             pk_field: primary key field to uniquely identify a participant
             orderby: field to sort the records by
         """
-        self.__pk_field = pk_field
-        self.__orderby = orderby
+        # Plain attributes rather than properties, implementations read these
+        # on every previous record lookup
+        self.pk_field: str = pk_field
+        self.orderby: str = orderby
+
+        self.__init_caches()
 
-    @property
-    def pk_field(self) -> str:
-        """primary key field.
+    def __init_caches(self):
+        """Create the caches of the drug ID/ADCID check results. Also called
+        on first use, for implementations that do not call
+        Datastore.__init__."""
+
+        # Cached results of the drug ID/ADCID checks, the same IDs tend to
+        # repeat across records
+        self.__rxcui_cache: Dict[int, bool] = {}
+        self.__adcid_cache: Dict[Tuple[int, bool], bool] = {}
+
+        # Results of the last prefetch_rxcuis call, drug ID -> valid or not
+        self.__rxcui_prefetched: Dict[int, bool] = {}
+
+    def is_valid_rxcui_cached(self, drugid: int) -> bool:
+        """Check whether a given drug ID is valid RXCUI, only calling
+        is_valid_rxcui the first time a drug ID is checked.
+
+        Args:
+            drugid: provided drug ID
 
         Returns:
-            str: primary key field to uniquely identify a participant
+            bool: True if provided drug ID is valid, else False
+        """
+        try:
+            valid = self.__rxcui_prefetched.get(drugid)
+        except AttributeError:
+            self.__init_caches()
+            valid = None
+
+        if valid is None:
+            valid = self.__rxcui_cache.get(drugid)
+        if valid is None:
+            valid = self.is_valid_rxcui(drugid)
+            _cache_result(self.__rxcui_cache, drugid, valid)
+        return valid
+
+    def prefetch_rxcuis(self, drugids: Iterable[int]):
+        """Check a batch of drug IDs ahead of validating the records, with a
+        single are_valid_rxcuis call for the drug IDs not already prefetched.
+        Replaces the results of the previous prefetch.
+
+        Args:
+            drugids: drug IDs that are about to be checked
         """
-        return self.__pk_field
+        try:
+            prefetched = self.__rxcui_prefetched
+        except AttributeError:
+            self.__init_caches()
+            prefetched = self.__rxcui_prefetched
+
+        drugids = set(drugids)
+        pending = drugids.difference(prefetched)
+        valid = self.are_valid_rxcuis(pending) if pending else set()
+        self.__rxcui_prefetched = {
+            drugid:
+            prefetched[drugid] if drugid in prefetched else drugid in valid
+            for drugid in drugids
+        }
+
+    def is_valid_adcid_cached(self, adcid: int, own: bool) -> bool:
+        """Check whether a given ADCID is valid, only calling is_valid_adcid
+        the first time an ADCID is checked.
 
-    @property
-    def orderby(self) -> str:
-        """order by field.
+        Args:
+            adcid: provided ADCID
+            own: whether to check own ADCID or another center's ADCID
 
         Returns:
-            str: field to sort the records by
+            bool: True if provided ADCID is valid, else False
         """
-        return self.__orderby
+        try:
+            valid = self.__adcid_cache.get((adcid, own))
+        except AttributeError:
+            self.__init_caches()
+            valid = None
+
+        if valid is None:
+            valid = self.is_valid_adcid(adcid, own)
+            _cache_result(self.__adcid_cache, (adcid, own), valid)
+        return valid
+
+    def clear_cache(self):
+        """Clear the cached drug ID/ADCID check results."""
+
+        self.__init_caches()
 
     @abstractmethod
     def get_previous_record(
@@ -53,6 +142,23 @@ class Datastore(ABC):
         """
         return None
 
+    def get_previous_records(
+        self, current_records: List[Dict[str, str]]
+    ) -> List[Optional[Dict[str, str]]]:
+        """Return the previous visit record for each of a batch of records,
+        used by NACCValidator.validate_many. Override this method if the
+        datastore can retrieve several records in a single query, by default
+        calls get_previous_record for each record.
+
+        Args:
+            current_records: Records currently being validated
+
+        Returns:
+            List[Dict[str, str]]: Previous record (or None if not found) for
+                each record, in the same order as current_records
+        """
+        return [self.get_previous_record(record) for record in current_records]
+
     @abstractmethod
     def get_previous_nonempty_record(
             self, current_record: Dict[str, str],
@@ -85,6 +191,19 @@ class Datastore(ABC):
         """
         return False
 
+    def are_valid_rxcuis(self, drugids: Set[int]) -> Set[int]:
+        """Check a set of drug IDs at once, used by prefetch_rxcuis. Override
+        this method if the datastore can check several drug IDs in a single
+        query, by default calls is_valid_rxcui for each drug ID.
+
+        Args:
+            drugids: provided drug IDs
+
+        Returns:
+            Set[int]: The valid drug IDs
+        """
+        return {drugid for drugid in drugids if self.is_valid_rxcui(drugid)}
+
     @abstractmethod
     def is_valid_adcid(self, adcid: int, own: bool) -> bool:
         """Abstract method to check whether a given ADCID is valid. Override
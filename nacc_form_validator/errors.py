@@ -1,6 +1,9 @@
 """Error-code and schema related constants."""
 
-from typing import Mapping
+from functools import lru_cache
+from string import Formatter
+from types import MappingProxyType
+from typing import Callable, Mapping, Optional
 
 from cerberus.errors import (
     BasicErrorHandler,
@@ -50,9 +53,106 @@ class ErrorDefs:
     ADCID_NOT_VALID = ErrorDefinition(0x3006, "function")
 
 
+# IMPORTANT - When adding a new error DON'T change the existing codes
+# Cerberus uses bit 5 and bit 7 to mark specific error types
+# Check https://docs.python-cerberus.org/customize.html for more info
+# Error messages are synced with ErrorDefs using the error code
+# Error codes are used to map b/w cerberus errors and NACC QC check codes
+_CUSTOM_ERROR_MESSAGES = MappingProxyType({
+    0x1000:
+    "cannot be greater than current date {0}",
+    0x1001:
+    "cannot be greater than current year {0}",
+    0x1002:
+    "max date/year comparison error - {0}",
+    0x1003:
+    "cannot be less than current date {0}",
+    0x1004:
+    "cannot be less than current year {0}",
+    0x1005:
+    "min date/year comparison error - {0}",
+    0x1006:
+    "cannot be empty",
+    0x1007:
+    "must be empty",
+    0x1008:
+    "{1} for if {2} then {3} - compatibility rule no: {0}",
+    0x1009:
+    "{1} for if {2} else {3} - compatibility rule no: {0}",
+    0x2000:
+    "{1} for if {2} in previous visit then {3} " +
+    "in current visit - temporal rule no: {0}",
+    0x2001:
+    "primary key variable {0} not set in current visit data",
+    0x2002:
+    "failed to retrieve the previous visit, cannot proceed with validation",
+    0x2003:
+    "error in formula evaluation - {0}",
+    0x2004:
+    "If GDS not attempted (nogds=1), total GDS score should be 88 " +
+    "- GDS rule no: {0}",
+    0x2005:
+    "If GDS not attempted (nogds=1), there cannot be >=12 questions with " +
+    "valid scores - GDS rule no: {0}",
+    0x2006:
+    "incorrect GDS score {1}, expected value {2} - GDS rule no: {0}",
+    0x2007:
+    "If GDS attempted (nogds=blank), at least 12 questions need to have " +
+    "valid scores - GDS rule no: {0}",
+    0x2008:
+    "input value doesn't satisfy the condition {0}",
+    0x2009:
+    "failed to retrieve record for previous visit, cannot proceed with " +
+    "validation {0}",
+    0x3000:
+    "Drug ID {0} is not a valid RXCUI",
+    0x3001:
+    "failed to convert value {0} to a date: {1}",
+    0x3002:
+    "input value {0} doesn't satisfy the condition: {1}",
+    0x3003:
+    "Error in comparing {0} to age at {1} ({2}): {3}",
+    0x3004:
+    "{1} for if {3} in current visit then {2} " +
+    "in previous visit - temporal rule no: {0}",
+    0x3005:
+    "Provided ADCID {0} does not match your center's ADCID",
+    0x3006:
+    "Provided ADCID {0} is not in the valid list of ADCIDs",
+})
+
+
+@lru_cache(maxsize=256)
+def _get_formatter(template: str) -> Optional[Callable[..., str]]:
+    """Get the formatter for an error message template, the template is only
+    parsed the first time it is used.
+
+    Args:
+        template: Message template with positional fields e.g. {0}
+
+    Returns:
+        Callable: Bound template.format to call with the error info, or None
+            if the template has named or nested fields (these are filled in
+            by BasicErrorHandler._format_message)
+    """
+    for _, field, spec, _ in Formatter().parse(template):
+        if field is not None and (not field.isdigit() or "{" in spec):
+            return None
+
+    return template.format
+
+
+# Shared default for fields without a meta definition
+_NO_META: Mapping = MappingProxyType({})
+
+
 class CustomErrorHandler(BasicErrorHandler):
     """Class to provide custom error messages."""
 
+    # Cerberus messages extended with the NACC specific ones, built once and
+    # shared by all handler instances
+    messages = {**BasicErrorHandler.messages, **_CUSTOM_ERROR_MESSAGES}
+
     def __init__(self, schema: Mapping = None, tree: ErrorTree = None):
         """
 
@@ -62,80 +162,15 @@ class CustomErrorHandler(BasicErrorHandler):
         """
 
         super().__init__()
-        self.__set_custom_error_codes()
         self._custom_schema = schema
 
-    def __set_custom_error_codes(self):
-        """Add custom error codes specific to NACC validation rules."""
-        # IMPORTANT - When adding a new error DON'T change the existing codes
-        # Cerberus uses bit 5 and bit 7 to mark specific error types
-        # Check https://docs.python-cerberus.org/customize.html for more info
-        # Error messages are synced with ErrorDefs using the error code
-        # Error codes are used to map b/w cerberus errors and NACC QC check codes
-        custom_errors = {
-            0x1000:
-            "cannot be greater than current date {0}",
-            0x1001:
-            "cannot be greater than current year {0}",
-            0x1002:
-            "max date/year comparison error - {0}",
-            0x1003:
-            "cannot be less than current date {0}",
-            0x1004:
-            "cannot be less than current year {0}",
-            0x1005:
-            "min date/year comparison error - {0}",
-            0x1006:
-            "cannot be empty",
-            0x1007:
-            "must be empty",
-            0x1008:
-            "{1} for if {2} then {3} - compatibility rule no: {0}",
-            0x1009:
-            "{1} for if {2} else {3} - compatibility rule no: {0}",
-            0x2000:
-            "{1} for if {2} in previous visit then {3} " +
-            "in current visit - temporal rule no: {0}",
-            0x2001:
-            "primary key variable {0} not set in current visit data",
-            0x2002:
-            "failed to retrieve the previous visit, cannot proceed with validation",
-            0x2003:
-            "error in formula evaluation - {0}",
-            0x2004:
-            "If GDS not attempted (nogds=1), total GDS score should be 88 " +
-            "- GDS rule no: {0}",
-            0x2005:
-            "If GDS not attempted (nogds=1), there cannot be >=12 questions with "
-            + "valid scores - GDS rule no: {0}",
-            0x2006:
-            "incorrect GDS score {1}, expected value {2} - GDS rule no: {0}",
-            0x2007:
-            "If GDS attempted (nogds=blank), at least 12 questions need to have "
-            + "valid scores - GDS rule no: {0}",
-            0x2008:
-            "input value doesn't satisfy the condition {0}",
-            0x2009:
-            "failed to retrieve record for previous visit, cannot proceed with "
-            + "validation {0}",
-            0x3000:
-            "Drug ID {0} is not a valid RXCUI",
-            0x3001:
-            "failed to convert value {0} to a date: {1}",
-            0x3002:
-            "input value {0} doesn't satisfy the condition: {1}",
-            0x3003:
-            "Error in comparing {0} to age at {1} ({2}): {3}",
-            0x3004:
-            "{1} for if {3} in current visit then {2} " +
-            "in previous visit - temporal rule no: {0}",
-            0x3005:
-            "Provided ADCID {0} does not match your center's ADCID",
-            0x3006:
-            "Provided ADCID {0} is not in the valid list of ADCIDs",
-        }
-
-        self.messages.update(custom_errors)
+        # Custom error message by field, for the fields that define one
+        self._errmsg_by_field: Mapping[str, str] = {}
+        for field, rules in (schema or {}).items():
+            error_msg = rules.get(SchemaDefs.META,
+                                  _NO_META).get(SchemaDefs.ERRMSG)
+            if error_msg:
+                self._errmsg_by_field[field] = field + ": " + error_msg
 
     def _format_message(self, field: str, error: ValidationError):
         """Display custom error message. Use the 'meta' tag in the schema to
@@ -147,10 +182,16 @@ class CustomErrorHandler(BasicErrorHandler):
             error: Error object generated by applying validation rules
         """
 
-        if self._custom_schema and field in self._custom_schema:
-            error_msg = (self._custom_schema[field].get(
-                SchemaDefs.META, {}).get(SchemaDefs.ERRMSG, ""))
-            if error_msg:
-                return field + ": " + error_msg
+        error_msg = self._errmsg_by_field.get(field)
+        if error_msg:
+            return error_msg
+
+        # custom codes are formatted from the handler's own messages, so
+        # changes to messages/get_error_messages() are picked up
+        if error.code in _CUSTOM_ERROR_MESSAGES:
+            template = self.messages.get(error.code)
+            formatter = _get_formatter(template) if template else None
+            if formatter:
+                return formatter(*error.info)
 
         return super()._format_message(field, error)
@@ -27,7 +27,8 @@ SOFTWARE.
 
 import logging
 import math
-from functools import reduce
+from functools import lru_cache
+from itertools import chain, islice
 
 logger = logging.getLogger(__name__)
 
@@ -43,8 +44,46 @@ def if_(*args):
         return None
 
 
+def and_(*args):
+    """Implements the 'and' operator, returns the first falsy or the last
+    value."""
+    result = True
+    for arg in args:
+        if not arg:
+            return arg
+        result = arg
+    return result
+
+
+def or_(*args):
+    """Implements the 'or' operator, returns the first truthy or the last
+    value."""
+    result = False
+    for arg in args:
+        if arg:
+            return arg
+        result = arg
+    return result
+
+
+def log_(a):
+    """Implements the 'log' operator, logs the value and returns it."""
+    if logger.isEnabledFor(logging.INFO):
+        logger.info(a)
+    return a
+
+
+# Types that soft_equals compares without any coertion
+_EXACT_TYPES = (int, bool, str)
+
+
 def soft_equals(a, b):
     """Implements the '==' operator, which does type JS-style coertion."""
+    # no coertion needed for the same (non float) types
+    type_a = type(a)
+    if type_a is type(b) and type_a in _EXACT_TYPES:
+        return a == b
+
     if isinstance(a, str) or isinstance(b, str):
         return str(a) == str(b)
     if isinstance(a, bool) or isinstance(b, bool):
@@ -64,13 +103,17 @@ def soft_equals(a, b):
 
 def hard_equals(a, b):
     """Implements the '===' operator."""
-    if type(a) != type(b):
+    if type(a) is not type(b):
         return False
     return a == b
 
 
-def less(a, b, *args):
-    """Implements the '<' operator with JS-style type coertion."""
+# Types that _less compares numerically
+_NUMERIC_TYPES = (int, float)
+
+
+def _less(a, b):
+    """Compares two values with JS-style type coertion."""
     # Handling empty values
     if a is None and b is None:
         return False
@@ -81,20 +124,56 @@ def less(a, b, *args):
     if b is None:
         return False
 
-    types = {type(a), type(b)}
-    if float in types or int in types:
+    type_a, type_b = type(a), type(b)
+    if type_a in _NUMERIC_TYPES and type_b in _NUMERIC_TYPES:
+        return a < b
+
+    if type_a in _NUMERIC_TYPES or type_b in _NUMERIC_TYPES:
         try:
             a, b = float(a), float(b)
         except TypeError:
             # NaN
             return False
-    return a < b and (not args or less(b, *args))
+    return a < b
+
+
+def _less_or_equal(a, b):
+    """Compares two values with JS-style type coertion."""
+    return _less(a, b) or soft_equals(a, b)
+
+
+def less(a, b, *args):
+    """Implements the '<' operator with JS-style type coertion. In a chain,
+    each operand is compared with the next one as coerced by the previous
+    comparison, so 1 < "2" < "10" compares 2.0 < "10" numerically."""
+    for c in args:
+        # Handling empty values, these end the chain
+        if a is None:
+            return b is not None
+
+        if b is None:
+            return False
+
+        if type(a) in _NUMERIC_TYPES or type(b) in _NUMERIC_TYPES:
+            try:
+                a, b = float(a), float(b)
+            except TypeError:
+                # NaN
+                return False
+
+        if not a < b:
+            return False
+        a, b = b, c
+
+    return _less(a, b)
 
 
 def less_or_equal(a, b, *args):
     """Implements the '<=' operator with JS-style type coertion."""
-    return (less(a, b) or soft_equals(a, b)) and (not args
-                                                  or less_or_equal(b, *args))
+    if not args:
+        return _less_or_equal(a, b)
+    values = (a, b, *args)
+    return all(map(_less_or_equal, values, values[1:]))
 
 
 def to_numeric(arg):
@@ -112,7 +191,18 @@ def to_numeric(arg):
 
 def plus(*args):
     """Sum converts either to ints or to floats."""
-    return sum(to_numeric(arg) for arg in args)
+    total = 0
+    for arg in args:
+        total += to_numeric(arg) if isinstance(arg, str) else arg
+    return total
+
+
+def multiply(*args):
+    """Implements the '*' operator, converts the arguments to floats."""
+    total = 1
+    for arg in args:
+        total *= float(arg)
+    return total
 
 
 def minus(*args):
@@ -124,39 +214,54 @@ def minus(*args):
 
 def merge(*args):
     """Implements the 'merge' operator for merging lists."""
-    ret = []
-    for arg in args:
-        if isinstance(arg, (list, tuple)):
-            ret += list(arg)
-        else:
-            ret.append(arg)
-    return ret
+    return list(
+        chain.from_iterable(arg if isinstance(arg, (list, tuple)) else (arg, )
+                            for arg in args))
+
+
+@lru_cache(maxsize=4096)
+def _split_path(var_name):
+    """Splits the variable name into the keys of the nested data."""
+    return tuple(var_name.split("."))
 
 
 def get_var(data, var_name, not_found=None):
     """Gets variable value from data dictionary."""
-    try:
-        for key in str(var_name).split("."):
+    keys = _split_path(str(var_name))
+    if len(keys) == 1 and isinstance(data, dict):
+        return data.get(keys[0], not_found)
+
+    for key in keys:
+        if isinstance(data, dict):
+            if key not in data:
+                return not_found
+            data = data[key]
+        elif isinstance(data, (list, tuple)):
             try:
-                data = data[key]
-            except TypeError:
                 data = data[int(key)]
-    except (KeyError, TypeError, ValueError):
-        return not_found
-    else:
-        return data
+            except (ValueError, IndexError):
+                return not_found
+        else:
+            try:
+                try:
+                    data = data[key]
+                except TypeError:
+                    data = data[int(key)]
+            except (KeyError, TypeError, ValueError, IndexError):
+                return not_found
+
+    return data
+
+
+# Marker for the variables not found in the data
+_NOT_FOUND = object()
 
 
 def missing(data, *args):
     """Implements the missing operator for finding missing variables."""
-    not_found = object()
     if args and isinstance(args[0], list):
         args = args[0]
-    ret = []
-    for arg in args:
-        if get_var(data, arg, not_found) is not_found:
-            ret.append(arg)
-    return ret
+    return [arg for arg in args if get_var(data, arg, _NOT_FOUND) is _NOT_FOUND]
 
 
 def missing_some(data, args, min_required=1):
@@ -164,10 +269,9 @@ def missing_some(data, args, min_required=1):
     if min_required < 1:
         return []
     found = 0
-    not_found = object()
     ret = []
     for arg in args:
-        if get_var(data, arg, not_found) is not_found:
+        if get_var(data, arg, _NOT_FOUND) is _NOT_FOUND:
             ret.append(arg)
         else:
             found += 1
@@ -187,7 +291,7 @@ def count_exact(args):
             "count_exact needs a base and at least 1 value to compare to")
 
     base = args[0]
-    return sum([1 for x in args[1:] if x == base])
+    return sum(1 for x in islice(args, 1, None) if x == base)
 
 
 operations = {
@@ -202,15 +306,15 @@ operations = {
     "!": lambda a: not a,
     "!!": bool,
     "%": lambda a, b: a % b,
-    "and": lambda *args: reduce(lambda total, arg: total and arg, args, True),
-    "or": lambda *args: reduce(lambda total, arg: total or arg, args, False),
+    "and": and_,
+    "or": or_,
     "?:": lambda a, b, c: b if a else c,
     "if": if_,
-    "log": lambda a: logger.info(a) or a,
-    "in": lambda a, b: a in b if "__contains__" in dir(b) else False,
+    "log": log_,
+    "in": lambda a, b: a in b if hasattr(b, "__contains__") else False,
     "cat": lambda *args: "".join(str(arg) for arg in args),
     "+": plus,
-    "*": lambda *args: reduce(lambda total, arg: total * float(arg), args, 1),
+    "*": multiply,
     "-": minus,
     "/": lambda a, b=None: a if b is None else float(a) / float(b),
     "min": lambda *args: min(args),
@@ -221,33 +325,240 @@ operations = {
 }
 
 
-def jsonLogic(tests, data=None):
-    """Executes the json-logic with given data."""
-    # You've recursed to a primitive, stop!
+# Operator -> (handler, whether the handler takes the data as first argument)
+_DISPATCH = {
+    **{operator: (handler, False)
+       for operator, handler in operations.items()},
+    "var": (get_var, True),
+    "missing": (missing, True),
+    "missing_some": (missing_some, True),
+}
+
+
+# Operators whose result does not only depend on their arguments
+_IMPURE_OPERATIONS = frozenset(["var", "missing", "missing_some", "log"])
+
+
+def _is_pure(tests):
+    """Checks whether the json-logic result only depends on the rule itself."""
+    if not isinstance(tests, dict):
+        return True
+
+    for operator, values in tests.items():
+        if operator in _IMPURE_OPERATIONS:
+            return False
+        if not isinstance(values, (list, tuple)):
+            values = [values]
+        if not all(_is_pure(val) for val in values):
+            return False
+
+    return True
+
+
+def _are_top_level_keys(keys):
+    """Checks whether the variable names are all top level (not nested)
+    keys."""
+    return all(isinstance(key, str) and "." not in key for key in keys)
+
+
+def _compile_missing(keys):
+    """Compiles the 'missing' operator for a constant list of top level keys,
+    checked all at once with dict membership instead of get_var."""
+    keys = tuple(keys)
+
+    def missing_keys(data):
+        if isinstance(data, dict):
+            return [key for key in keys if key not in data]
+        return missing(data, *keys)
+
+    return missing_keys
+
+
+def _compile_missing_some(keys, min_required=1):
+    """Compiles the 'missing_some' operator for a constant list of top level
+    keys."""
+    keys = tuple(keys)
+
+    def missing_some_keys(data):
+        if not isinstance(data, dict):
+            return missing_some(data, keys, min_required)
+        if min_required < 1:
+            return []
+        ret = [key for key in keys if key not in data]
+        if len(keys) - len(ret) >= min_required:
+            return []
+        return ret
+
+    return missing_some_keys
+
+
+def _compile_in(items):
+    """Compiles the 'in' operator for a constant list of items, the membership
+    is checked against a frozenset of the items when they are hashable."""
+    try:
+        members = frozenset(items)
+    except TypeError:
+        return lambda value: value in items
+
+    def contains(value):
+        try:
+            return value in members
+        except TypeError:
+            # unhashable value
+            return value in items
+
+    return contains
+
+
+# Max depth of the generated expressions, deeper sub-rules are compiled
+# into their own function (Python limits the nesting of expressions)
+_MAX_EXPRESSION_DEPTH = 32
+
+
+class _RuleBuilder:
+    """Helper class to collect the constants of the generated source."""
+
+    def __init__(self):
+        self.namespace = {"get_var": get_var}
+
+    def add_constant(self, value):
+        """Bind a constant in the namespace of the generated function and
+        return its name in the generated source."""
+        name = f"_c{len(self.namespace)}"
+        self.namespace[name] = value
+        return name
+
+
+def _evaluate_pure(tests):
+    """Evaluates json-logic that doesn't reference the data (see _is_pure)."""
     if tests is None or not isinstance(tests, dict):
         return tests
 
-    data = data or {}
+    operator, values = next(iter(tests.items()))
+    if not isinstance(values, list) and not isinstance(values, tuple):
+        values = [values]
+
+    return operations[operator](*[_evaluate_pure(val) for val in values])
+
+
+def _is_top_level_var(values):
+    """Checks whether the 'var' arguments are a constant top level key, with
+    an optional constant default."""
+    return (1 <= len(values) <= 2 and isinstance(values[0], str)
+            and values[0] and "." not in values[0]
+            and not any(isinstance(val, dict) for val in values))
 
-    operator = list(tests.keys())[0]
-    values = tests[operator]
+
+def _compile_expression(tests, builder, depth=0):
+    """Generates the Python expression evaluating the json-logic against
+    `data`.
+
+    Raises:
+        ValueError: If the rule has an unrecognized operation
+    """
+    # Primitives evaluate to themselves
+    if tests is None or not isinstance(tests, dict):
+        return builder.add_constant(tests)
+
+    if depth > _MAX_EXPRESSION_DEPTH:
+        return f"{builder.add_constant(compile_rule(tests))}(data)"
+
+    operator, values = next(iter(tests.items()))
+    try:
+        handler, takes_data = _DISPATCH[operator]
+    except KeyError:
+        raise ValueError(f"Unrecognized operation {operator}") from None
 
     # Easy syntax for unary operators, like {"var": "x"} instead of strict
     # {"var": ["x"]}
     if not isinstance(values, list) and not isinstance(values, tuple):
         values = [values]
 
-    # Recursion!
-    values = [jsonLogic(val, data) for val in values]
+    args = [_compile_expression(val, builder, depth + 1) for val in values]
+
+    if operator == "var" and _is_top_level_var(values):
+        # same as get_var for dicts, without the call
+        key = builder.add_constant(values[0])
+        default = args[1] if len(args) > 1 else "None"
+        return (f"(data.get({key}, {default}) if isinstance(data, dict) "
+                f"else get_var(data, {key}, {default}))")
 
-    if operator == "var":
-        return get_var(data, *values)
     if operator == "missing":
-        return missing(data, *values)
-    if operator == "missing_some":
-        return missing_some(data, *values)
+        keys = values[0] if values and isinstance(values[0], list) else values
+        if _are_top_level_keys(keys):
+            return f"{builder.add_constant(_compile_missing(keys))}(data)"
+
+    if (operator == "missing_some" and values
+            and isinstance(values[0], list)
+            and _are_top_level_keys(values[0])
+            and all(not isinstance(val, dict) for val in values[1:])):
+        missing_keys = _compile_missing_some(*values)
+        return f"{builder.add_constant(missing_keys)}(data)"
+
+    if takes_data:
+        args.insert(0, "data")
+    elif _is_pure(tests):
+        try:
+            result = _evaluate_pure(tests)
+        except Exception:  # pylint: disable=(broad-except)
+            # leave the error to be raised when the rule is evaluated
+            pass
+        else:
+            # mutable results are not shared between evaluations
+            if not isinstance(result, (list, dict)):
+                return builder.add_constant(result)
+
+    if (operator == "in" and len(values) == 2
+            and isinstance(values[1], (list, tuple))):
+        return f"{builder.add_constant(_compile_in(values[1]))}({args[0]})"
+
+    # short-circuit the logical operators, the remaining arguments are
+    # only evaluated if they can change the result
+    if operator in ("and", "or") and args:
+        return f"({f' {operator} '.join(args)})"
+
+    if (operator == "if" and args) or (operator == "?:" and len(args) == 3):
+        branches = [
+            f"{args[i + 1]} if {args[i]} else"
+            for i in range(0, len(args) - 1, 2)
+        ]
+        otherwise = args[-1] if len(args) % 2 else "None"
+        return f"({' '.join(branches)} {otherwise})"
+
+    return f"{builder.add_constant(handler)}({', '.join(args)})"
 
-    if operator not in operations:
-        raise ValueError(f"Unrecognized operation {operator}")
 
-    return operations[operator](*values)
+def compile_rule(tests):
+    """Compiles the json-logic into a function of the data.
+
+    The rule is walked once and generated as a single Python expression,
+    operators are resolved and the sub-rules that don't reference the data
+    are evaluated at compile time.
+
+    Raises:
+        ValueError: If the rule has an unrecognized operation
+    """
+    # Primitives evaluate to themselves
+    if tests is None or not isinstance(tests, dict):
+        return lambda data: tests
+
+    builder = _RuleBuilder()
+    expression = _compile_expression(tests, builder)
+    code = compile(f"def rule(data):\n    return {expression}\n",
+                   "<json_logic>", "exec")
+    exec(code, builder.namespace)  # pylint: disable=(exec-used)
+
+    return builder.namespace["rule"]
+
+
+def jsonLogic(tests, data=None):
+    """Executes the json-logic with given data.
+
+    The rule is compiled on each call, use compile_rule to evaluate the
+    same rule repeatedly.
+    """
+    # You've recursed to a primitive, stop!
+    if tests is None or not isinstance(tests, dict):
+        return tests
+
+    return compile_rule(tests)(data or {})
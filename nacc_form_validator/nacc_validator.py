@@ -2,25 +2,246 @@
 library)."""
 
 import logging
+from collections import defaultdict
+from datetime import date
 from datetime import datetime as dt
-from typing import Any, Dict, List, Mapping, Optional, Tuple
-
+from itertools import islice
+from operator import add, attrgetter, gt, itemgetter, lt, mul, sub, truediv
+from typing import (
+    Any,
+    Callable,
+    DefaultDict,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from cerberus import errors
 from cerberus.validator import Validator
 from dateutil import parser
 
 from nacc_form_validator import utils
 from nacc_form_validator.datastore import Datastore
 from nacc_form_validator.errors import CustomErrorHandler, ErrorDefs
-from nacc_form_validator.json_logic import jsonLogic
+from nacc_form_validator.json_logic import compile_rule
 from nacc_form_validator.keys import SchemaDefs
 
 log = logging.getLogger(__name__)
 
 
+# Python data type for each of the supported cerberus data types
+_DATA_TYPES: Dict[str, str] = {
+    "integer": "int",
+    "string": "str",
+    "float": "float",
+    "boolean": "bool",
+    "date": "date",
+    "datetime": "datetime",
+}
+
+# Function to cast a string value to each of the supported data types,
+# and the type of the casted value
+_CASTERS: Dict[str, Tuple[Callable[[str], object], type]] = {
+    "int": (int, int),
+    "float": (float, float),
+    "bool": (bool, bool),
+    "date": (utils.convert_to_date, date),
+    "datetime": (utils.convert_to_datetime, dt),
+}
+
+
+# For the min/max rules wrt current date/year: the comparison that fails
+# the rule and the errors for invalid input, current date and current year
+_CURRENT_DATE_CHECKS = {
+    "max": (gt, ErrorDefs.INVALID_DATE_MAX, ErrorDefs.CURR_DATE_MAX,
+            ErrorDefs.CURR_YEAR_MAX),
+    "min": (lt, ErrorDefs.INVALID_DATE_MIN, ErrorDefs.CURR_DATE_MIN,
+            ErrorDefs.CURR_YEAR_MIN),
+}
+
+# Function to get the date to compare with the current date, by data type
+_DATE_GETTERS: Dict[str, Callable[[Any], date]] = {
+    "str": utils.convert_to_date,
+    "date": lambda value: value,
+    "datetime": lambda value: value.date(),
+}
+
+# Function to apply each compare_with adjustment operator (other than abs)
+_ADJUSTMENTS: Dict[str, Callable[[Any, Any], Any]] = {
+    "+": add,
+    "-": sub,
+    "*": mul,
+    "/": truediv,
+}
+
+# Function to get the value of each special current date key from today
+_TODAY_GETTERS: Dict[str, Callable[[date], Union[date, int]]] = {
+    SchemaDefs.CRR_DATE: lambda today: today,
+    SchemaDefs.CRR_YEAR: attrgetter("year"),
+    SchemaDefs.CRR_MONTH: attrgetter("month"),
+    SchemaDefs.CRR_DAY: attrgetter("day"),
+}
+
+# Names of the methods implementing the custom functions (see _validate_function)
+_FUNCTION_NAMES: Dict[str, str] = {}
+
+# Max number of previous records to keep in the validator's cache
+PREV_RECORDS_CACHE_SIZE = 1024
+
+# Number of records validate_many() casts and prefetches the drug IDs for
+# at a time
+VALIDATE_MANY_CHUNK_SIZE = 256
+
+# Rules that need other validators, the datastore or formula evaluation
+_COSTLY_RULES = frozenset([
+    "compatibility",
+    "temporalrules",
+    "logic",
+    "compute_gds",
+    "compare_with",
+    "compare_age",
+    "function",
+    "check_with",
+])
+
+
+def _get_formatter(formatting: str) -> Optional[Callable[[str], object]]:
+    """Get the utils function for a formatting, e.g. convert_to_date.
+
+    Args:
+        formatting: Formatting specified in the schema def
+
+    Returns:
+        Callable: Conversion function, or None if not defined
+    """
+    func = getattr(utils, f"convert_to_{formatting}", None)
+    return func if callable(func) else None
+
+
+def _checks_rxnorm(rules: Mapping) -> bool:
+    """Whether a field's rules include check_with rxnorm.
+
+    Args:
+        rules: Rule definitions for the field
+
+    Returns:
+        bool: True if the field is checked against RXNORM
+    """
+    check_with = rules.get("check_with")
+    if isinstance(check_with, (list, tuple)):
+        return "rxnorm" in check_with
+    return check_with == "rxnorm"
+
+
+def _uses_previous_record(rules: Mapping) -> bool:
+    """Whether a field's rules need the previous record of the participant
+    (regardless of empty fields), see validate_many().
+
+    Args:
+        rules: Rule definitions for the field
+
+    Returns:
+        bool: True if a temporal rule or compare_with rule fetches the
+            previous record without ignore_empty
+    """
+    if any(not temporalrule.get(SchemaDefs.IGNORE_EMPTY)
+           for temporalrule in rules.get("temporalrules") or ()):
+        return True
+
+    comparison = rules.get("compare_with")
+    return bool(comparison and comparison.get(SchemaDefs.PREV_RECORD)
+                and not comparison.get(SchemaDefs.IGNORE_EMPTY))
+
+
+class _CompatPlan(NamedTuple):
+    """Normalized compatibility constraint, see __plan_compatibility."""
+
+    rule_no: int
+    if_op: str
+    then_op: str
+    else_op: str
+    if_conds: Mapping
+    then_conds: Mapping
+    else_conds: Optional[Mapping]
+
+
+class _TemporalPlan(NamedTuple):
+    """Normalized temporal rule, see __plan_temporalrules."""
+
+    rule_no: int
+    swap_order: bool
+    ignore_empty_fields: Optional[Tuple[str, ...]]
+    prev_op: str
+    curr_op: str
+    prev_conds: Mapping
+    curr_conds: Mapping
+
+
 class ValidationException(Exception):
     """Raised when an system error occurs during validation."""
 
 
+class _ConditionRecord(Mapping):
+    """Read-only view of the record handed to the temporary validators that
+    check a set of conditions. Lookups go to the full record, but iterating
+    the view only yields the fields of the subschema, so that cerberus does
+    not walk every other field of the record (as unknown fields) for each
+    condition. Copying returns the view itself, the record is never modified.
+    """
+
+    __slots__ = ("record", "fields")
+
+    def __init__(self, record: Mapping[str, object], fields: Tuple[str, ...]):
+        """
+        Args:
+            record: Record being validated
+            fields: Fields of the subschema
+        """
+        if isinstance(record, _ConditionRecord):
+            record = record.record
+        self.record = record
+        self.fields = fields
+
+    def __getitem__(self, key: str) -> object:
+        return self.record[key]
+
+    def __contains__(self, key: object) -> bool:
+        return key in self.record
+
+    def get(self, key: str, default: object = None) -> object:
+        return self.record.get(key, default)
+
+    def __iter__(self) -> Iterator[str]:
+        record = self.record
+        return (field for field in self.fields if field in record)
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __copy__(self) -> "_ConditionRecord":
+        return self
+
+
+def _full_record(document: Mapping[str, object]) -> Mapping[str, object]:
+    """Returns the record behind a _ConditionRecord view, or the document.
+
+    Args:
+        document: Document being validated
+
+    Returns:
+        Mapping[str, object]: Full record
+    """
+    if isinstance(document, _ConditionRecord):
+        return document.record
+    return document
+
+
 class NACCValidator(Validator):
     """NACCValidator class to extend cerberus.Validator."""
 
@@ -35,17 +256,62 @@ class NACCValidator(Validator):
         # Data type map for each field
         self.__dtypes: Dict[str, str] = self.__populate_data_types()
 
+        # Function to cast the value and the resulting type of each field
+        # with a non string type
+        self.__casters: Dict[str, Tuple[Callable[[str], object], type]] = {
+            key: _CASTERS[dtype]
+            for key, dtype in (self.__dtypes or {}).items()
+            if dtype in _CASTERS
+        }
+
+        # Fields defined in the schema
+        self.__schema_keys: Tuple[str, ...] = tuple(self.schema or ())
+        self.__schema_key_set: frozenset = frozenset(self.__schema_keys)
+
+        # Function to convert the min/max bound and value of each field with
+        # a formatting, None if not defined in utils (see __validate_bound)
+        self.__formatters: Dict[str, Optional[Callable[[str], object]]] = {
+            key: _get_formatter(configs[SchemaDefs.FORMATTING])
+            for key, configs in (self.schema or {}).items()
+            if SchemaDefs.FORMATTING in configs
+        }
+
+        # Fields checked against RXNORM, see validate_many()
+        self.__rxnorm_fields: Tuple[str, ...] = tuple(
+            key for key, rules in (self.schema or {}).items()
+            if _checks_rxnorm(rules))
+
+        # Whether any rule needs the previous record, see validate_many()
+        self.__uses_prev_record: bool = any(
+            _uses_previous_record(rules)
+            for rules in (self.schema or {}).values())
+
         # Datastore instance
         self.__datastore: Datastore = None
 
         # Primary key field of the project
         self.__pk_field: str = None
 
-        # Cache of previous records that has been retrieved
-        self.__prev_records: Dict[str, Mapping] = {}
+        # Cache of previous records that has been retrieved (or not found),
+        # (record id, sorted ignore_empty_fields) -> previous record
+        self.__prev_records: Dict[Tuple[str, Optional[Tuple[str, ...]]],
+                                  Optional[Mapping]] = {}
 
         # List of system errors occured by field
-        self.__sys_errors: Dict[str, List[str]] = {}
+        self.__sys_errors: DefaultDict[str, List[str]] = defaultdict(list)
+
+        # Current date, set once per validate() call, see __get_today()
+        self.__today: Optional[date] = None
+
+        # Normalized compatibility/temporal rules and compiled logic formulas
+        # of the schema, id(rules) -> (rules, normalized rules)
+        self.__rule_plans: Dict[int, Tuple[Union[List[Mapping], Mapping],
+                                           Any]] = {}
+
+        # Temporary validators to check the sets of conditions,
+        # (field, id(conditions)) -> (conditions, validator)
+        self.__subvalidators: Dict[Tuple[str, int],
+                                   Tuple[Mapping, "NACCValidator"]] = {}
 
     @property
     def dtypes(self) -> Dict[str, str]:
@@ -67,22 +333,16 @@ class NACCValidator(Validator):
         data_types = {}
         for key, configs in self.schema.items():
             if SchemaDefs.TYPE in configs:
-                if configs[SchemaDefs.TYPE] == "integer":
-                    data_types[key] = "int"
-                elif configs[SchemaDefs.TYPE] == "string":
-                    data_types[key] = "str"
-                elif configs[SchemaDefs.TYPE] == "float":
-                    data_types[key] = "float"
-                elif configs[SchemaDefs.TYPE] == "boolean":
-                    data_types[key] = "bool"
-                elif configs[SchemaDefs.TYPE] == "date":
-                    data_types[key] = "date"
-                elif configs[SchemaDefs.TYPE] == "datetime":
-                    data_types[key] = "datetime"
+                cerberus_type = configs[SchemaDefs.TYPE]
+                # a list of types is not supported
+                data_type = (_DATA_TYPES.get(cerberus_type) if isinstance(
+                    cerberus_type, str) else None)
+                if data_type:
+                    data_types[key] = data_type
                 else:
                     log.warning(
                         "Unsupported datatype %s for field %s",
-                        configs[SchemaDefs.TYPE],
+                        cerberus_type,
                         key,
                     )
 
@@ -135,10 +395,7 @@ class NACCValidator(Validator):
             field: Variable name
             err_msg: Error message
         """
-        if field in self.__sys_errors:
-            self.__sys_errors[field].append(err_msg)
-        else:
-            self.__sys_errors[field] = [err_msg]
+        self.__sys_errors[field].append(err_msg)
 
     def reset_sys_errors(self):
         """Clear the system errors."""
@@ -150,6 +407,154 @@ class NACCValidator(Validator):
 
         self.__prev_records.clear()
 
+    def reset_errors(self):
+        """Clear the errors of the last validated record, for records that are
+        accepted without running the validator (see QualityCheck.compile)."""
+
+        self._errors = errors.ErrorList()
+        self.recent_error = None
+        self.document_error_tree = errors.DocumentErrorTree()
+        self.schema_error_tree = errors.SchemaErrorTree()
+
+    def validate(self, document: Mapping[str, object], *args,
+                 **kwargs) -> bool:
+        """Override to reset the current date for each document.
+
+        Check ~cerberus.Validator.validate for the arguments.
+        """
+        self.__today = None
+        return super().validate(document, *args, **kwargs)
+
+    __call__ = validate
+
+    def __get_today(self) -> date:
+        """Returns the current date, computed once per validate() call so
+        that all the rules of a document are checked against the same date.
+
+        Returns:
+            date: Current date
+        """
+        if self.__today is None:
+            self.__today = dt.now().date()
+        return self.__today
+
+    def validate_many(
+        self,
+        records: Iterable[Dict[str, str]],
+        accept: Optional[Callable[[Mapping[str, object]], bool]] = None
+    ) -> Iterator[Tuple[bool, bool, Dict[str, List[str]],
+                        Optional[errors.DocumentErrorTree]]]:
+        """Cast and validate a batch of records. The validator's per schema
+        state (casters, normalized rules, temporary validators) is reused
+        across the records.
+
+        Args:
+            records: Input records, each as Dict[field, value]. Read in
+                chunks of VALIDATE_MANY_CHUNK_SIZE, the drug IDs and the
+                previous records of each chunk are retrieved from the
+                datastore at once.
+            accept (optional): Check run on each casted record before the
+                validator, records it accepts pass without being validated
+                (see QualityCheck.compile)
+
+        Returns:
+            Iterator: (passed, sys_failure, errors, error_tree) for each
+            record, in the same order as the input records. On a system
+            error, errors are the system errors and error_tree is None.
+        """
+
+        records = iter(records)
+        while True:
+            documents = [
+                self.cast_record(dict(record))
+                for record in islice(records, VALIDATE_MANY_CHUNK_SIZE)
+            ]
+            if not documents:
+                return
+
+            # a single record gains nothing from the bulk lookups, leave its
+            # lookups to the rules that need them
+            prev_records = {}
+            if len(documents) > 1:
+                self.__prefetch_rxcuis(documents)
+                prev_records = self.__prefetch_previous_records(documents)
+
+            for index, document in enumerate(documents):
+                self.reset_sys_errors()
+                self.reset_record_cache()
+
+                # Records passing the check have no errors to report, clear
+                # the validator state left by the previous record
+                if accept and accept(document):
+                    self.reset_errors()
+                    yield True, False, {}, errors.DocumentErrorTree()
+                    continue
+
+                if index in prev_records:
+                    self.__prev_records[(document[self.primary_key],
+                                         None)] = prev_records[index]
+
+                try:
+                    passed = self.validate(document, normalize=False)
+                except ValidationException:
+                    yield False, True, dict(self.sys_errors), None
+                    continue
+
+                yield passed, False, self.errors, self.document_error_tree
+
+    def __prefetch_rxcuis(self, documents: List[Dict[str, object]]):
+        """Check the drug IDs of a chunk of records with the datastore at
+        once, so that _check_with_rxnorm finds them already checked.
+
+        Args:
+            documents: Casted records
+        """
+        if not self.__rxnorm_fields or not self.datastore:
+            return
+
+        drugids = set()
+        for document in documents:
+            for field in self.__rxnorm_fields:
+                value = document.get(field)
+                if value and type(value) is int:
+                    drugids.add(value)
+
+        if drugids:
+            self.datastore.prefetch_rxcuis(drugids)
+
+    def __prefetch_previous_records(
+        self, documents: List[Dict[str, object]]
+    ) -> Dict[int, Optional[Mapping]]:
+        """Retrieve the previous records of a chunk of records with the
+        datastore at once, so that __get_previous_record finds them already
+        cached.
+
+        Args:
+            documents: Casted records
+
+        Returns:
+            Dict[int, Mapping]: index of the record -> casted previous record
+                (or None if not found), for each record with a primary key
+        """
+        if (not self.__uses_prev_record or not self.datastore
+                or not self.primary_key):
+            return {}
+
+        indices = [
+            index for index, document in enumerate(documents)
+            if document.get(self.primary_key)
+        ]
+        if not indices:
+            return {}
+
+        prev_records = self.datastore.get_previous_records(
+            [documents[index] for index in indices])
+
+        return {
+            index: self.cast_record(prev_ins) if prev_ins else None
+            for index, prev_ins in zip(indices, prev_records)
+        }
+
     def get_error_messages(self) -> Dict[int, str]:
         """Returns the list of error messages by error code.
 
@@ -184,18 +589,12 @@ class NACCValidator(Validator):
             if value is None:
                 continue
 
-            if key in self.dtypes:
+            caster = self.__casters.get(key)
+            # skip the values already of the expected type
+            if caster and type(value) is not caster[1]:
+                caster = caster[0]
                 try:
-                    if self.dtypes[key] == "int":
-                        record[key] = int(value)
-                    elif self.dtypes[key] == "float":
-                        record[key] = float(value)
-                    elif self.dtypes[key] == "bool":
-                        record[key] = bool(value)
-                    elif self.dtypes[key] == "date":
-                        record[key] = utils.convert_to_date(value)
-                    elif self.dtypes[key] == "datetime":
-                        record[key] = utils.convert_to_datetime(value)
+                    record[key] = caster(value)
                 except (ValueError, TypeError, parser.ParserError) as error:
                     log.error(
                         "Failed to cast variable %s, value %s to type %s - %s",
@@ -206,19 +605,21 @@ class NACCValidator(Validator):
                     )
                     record[key] = value
 
-        for key in self.schema:
-            if key not in record:
-                record[key] = None
+        if not record.keys() >= self.__schema_key_set:
+            for key in self.__schema_keys:
+                if key not in record:
+                    record[key] = None
 
         return record
 
     def __get_previous_record(
         self,
         field: str,
-        ignore_empty_fields: Optional[List[str]] = None
+        ignore_empty_fields: Optional[Tuple[str, ...]] = None
     ) -> Optional[Dict[str, Mapping]]:
-        """Get the previous record from the Datastore; if not skipping empty
-        records, stores it in the prev_records cache.
+        """Get the previous record from the Datastore; stores it (or None if
+        not found) in the prev_records cache by record id and
+        ignore_empty_fields.
 
         Args:
             field: Variable name
@@ -238,28 +639,31 @@ class NACCValidator(Validator):
             self.__add_system_error(field, err_msg)
             raise ValidationException(err_msg)
 
-        if self.primary_key not in self.document or not self.document[
-                self.primary_key]:
+        record_id = self.document.get(self.primary_key)
+        if not record_id:
             self._error(field, ErrorDefs.NO_PRIMARY_KEY, self.primary_key)
             return None
 
-        record_id = self.document[self.primary_key]
+        # If the previous record was already retrieved (or not found) for the
+        # same set of ignore_empty_fields, use it
+        # sorted in the key only, the datastore gets the fields in schema order
+        cache_key = (record_id, tuple(sorted(ignore_empty_fields))
+                     if ignore_empty_fields else None)
+        if cache_key in self.__prev_records:
+            return self.__prev_records[cache_key]
 
-        ignore_empty = bool(ignore_empty_fields)
-        # If the previous record was already retrieved and not ignore_empty, use it
-        # Similarly only save into cache if ignore_empty is false
-        if not ignore_empty and record_id in self.__prev_records:
-            prev_ins = self.__prev_records[record_id]
-        else:
-            prev_ins = (self.__datastore.get_previous_nonempty_record(
-                self.document, ignore_empty_fields) if ignore_empty else
-                        self.__datastore.get_previous_record(self.document))
+        document = _full_record(self.document)
+        prev_ins = (self.__datastore.get_previous_nonempty_record(
+            document, list(ignore_empty_fields)) if ignore_empty_fields else
+                    self.__datastore.get_previous_record(document))
 
-            if prev_ins:
-                prev_ins = self.cast_record(prev_ins)
+        if prev_ins:
+            prev_ins = self.cast_record(prev_ins)
 
-            if not ignore_empty:
-                self.__prev_records[record_id] = prev_ins
+        # drop the oldest entry when full
+        if len(self.__prev_records) >= PREV_RECORDS_CACHE_SIZE:
+            del self.__prev_records[next(iter(self.__prev_records))]
+        self.__prev_records[cache_key] = prev_ins
 
         return prev_ins
 
@@ -277,20 +681,13 @@ class NACCValidator(Validator):
         Returns:
             Any: Value of the specified key or None
         """
-        if key == SchemaDefs.CRR_DATE:
-            return dt.now().date()
-
-        if key == SchemaDefs.CRR_YEAR:
-            return dt.now().date().year
-
-        if key == SchemaDefs.CRR_MONTH:
-            return dt.now().date().month
-
-        if key == SchemaDefs.CRR_DAY:
-            return dt.now().date().day
+        getter = _TODAY_GETTERS.get(key)
+        if getter:
+            return getter(self.__get_today())
 
-        if self.document and key in self.document:
-            return self.document[key]
+        document = _full_record(self.document)
+        if document and key in document:
+            return document[key]
 
         return key if return_self else None
 
@@ -330,11 +727,11 @@ class NACCValidator(Validator):
         if value is None:
             super()._drop_remaining_rules('compare_age')
 
-    def _validate_max(self, max_value: object, field: str, value: object):
-        """Override max rule to support validations wrt current date/year.
+    def _validate_regex(self, pattern: str, field: str, value: object):
+        """Override regex rule to use the precompiled pattern.
 
         Args:
-            max_value: Maximum value specified in the schema def
+            pattern: Regex pattern specified in the schema def
             field: Variable name
             value: Variable value
 
@@ -342,57 +739,110 @@ class NACCValidator(Validator):
         Cerberus uses it to validate the schema definition.
 
         The rule's arguments are validated against this schema:
-            {'nullable': False}
+            {'type': 'string'}
         """
 
-        if max_value in (SchemaDefs.CRR_DATE, SchemaDefs.CRR_YEAR):
-            dtype = self.dtypes[field] if field in self.dtypes else "undefined"
-            try:
-                if dtype == "str":
-                    input_date = utils.convert_to_date(value)
-                elif dtype == "date":
-                    input_date = value
-                elif dtype == "datetime":
-                    input_date = value.date()
-                elif dtype == "int" and max_value == SchemaDefs.CRR_YEAR:
-                    input_date = dt(value, 1, 1).date()
-                else:
-                    message = f"{max_value} not supported for {dtype} datatype"
-                    self._error(field, ErrorDefs.INVALID_DATE_MAX, message)
+        if not isinstance(value, str):
+            return
+
+        if not utils.compile_regex(pattern).match(value):
+            self._error(field, errors.REGEX_MISMATCH)
+
+    def __validate_bound(self, rule: str, bound: object, field: str,
+                         value: object, validate: Callable[[object, str, object],
+                                                           None]):
+        """Shared implementation of the min/max rules.
+
+        Args:
+            rule: min or max
+            bound: Minimum/maximum value specified in the schema def
+            field: Variable name
+            value: Variable value
+            validate: Cerberus implementation of the rule
+
+        Raises:
+            ValidationException: If the formatting function is not defined
+        """
+
+        if bound in (SchemaDefs.CRR_DATE, SchemaDefs.CRR_YEAR):
+            self.__validate_current_date_bound(rule, bound, field, value)
+            return
+
+        if field in self.__formatters:
+            invalid_error = _CURRENT_DATE_CHECKS[rule][1]
+            func = self.__formatters[field]
+            if func:
+                try:
+                    bound = func(bound)
+                    value = func(value)
+                except (
+                        AttributeError,
+                        parser.ParserError,
+                        TypeError,
+                        ValueError,
+                ) as error:
+                    self._error(field, invalid_error, str(error))
                     return
-            except (ValueError, TypeError, parser.ParserError) as error:
-                self._error(field, ErrorDefs.INVALID_DATE_MAX, str(error))
+            else:
+                methodname = f"convert_to_{self.schema[field][SchemaDefs.FORMATTING]}"
+                err_msg = f"{methodname} not defined in the validator module"
+                self.__add_system_error(field, err_msg)
+                raise ValidationException(err_msg)
+
+        validate(bound, field, value)
+
+    def __validate_current_date_bound(self, rule: str, bound: str,
+                                      field: str, value: object):
+        """Validate the min/max rule wrt current date/year.
+
+        Args:
+            rule: min or max
+            bound: current_date or current_year
+            field: Variable name
+            value: Variable value
+        """
+
+        exceeds, invalid_error, date_error, year_error = _CURRENT_DATE_CHECKS[
+            rule]
+        dtype = self.dtypes[field] if field in self.dtypes else "undefined"
+        try:
+            if dtype == "int" and bound == SchemaDefs.CRR_YEAR:
+                input_date = dt(value, 1, 1).date()
+            elif dtype in _DATE_GETTERS:
+                input_date = _DATE_GETTERS[dtype](value)
+            else:
+                message = f"{bound} not supported for {dtype} datatype"
+                self._error(field, invalid_error, message)
                 return
+        except (ValueError, TypeError, parser.ParserError) as error:
+            self._error(field, invalid_error, str(error))
+            return
 
-            curr_date = dt.now().date()
+        curr_date = self.__get_today()
 
-            if max_value == SchemaDefs.CRR_DATE and input_date > curr_date:
-                self._error(field, ErrorDefs.CURR_DATE_MAX, str(curr_date))
-            elif max_value == SchemaDefs.CRR_YEAR and input_date.year > curr_date.year:
-                self._error(field, ErrorDefs.CURR_YEAR_MAX, curr_date.year)
-        else:
-            if SchemaDefs.FORMATTING in self.schema[field]:
-                methodname = f"convert_to_{self.schema[field][SchemaDefs.FORMATTING]}"
-                func = getattr(utils, methodname, None)
-                if func and callable(func):
-                    try:
-                        max_value = func(max_value)
-                        value = func(value)
-                    except (
-                            AttributeError,
-                            parser.ParserError,
-                            TypeError,
-                            ValueError,
-                    ) as error:
-                        self._error(field, ErrorDefs.INVALID_DATE_MAX,
-                                    str(error))
-                        return
-                else:
-                    err_msg = f"{methodname} not defined in the validator module"
-                    self.__add_system_error(field, err_msg)
-                    raise ValidationException(err_msg)
+        if bound == SchemaDefs.CRR_DATE and exceeds(input_date, curr_date):
+            self._error(field, date_error, str(curr_date))
+        elif bound == SchemaDefs.CRR_YEAR and exceeds(input_date.year,
+                                                      curr_date.year):
+            self._error(field, year_error, curr_date.year)
 
-            super()._validate_max(max_value, field, value)
+    def _validate_max(self, max_value: object, field: str, value: object):
+        """Override max rule to support validations wrt current date/year.
+
+        Args:
+            max_value: Maximum value specified in the schema def
+            field: Variable name
+            value: Variable value
+
+        Note: Don't remove below docstring,
+        Cerberus uses it to validate the schema definition.
+
+        The rule's arguments are validated against this schema:
+            {'nullable': False}
+        """
+
+        self.__validate_bound("max", max_value, field, value,
+                              super()._validate_max)
 
     def _validate_min(self, min_value: object, field: str, value: object):
         """Override min rule to support validations wrt current date/year.
@@ -409,54 +859,8 @@ class NACCValidator(Validator):
             {'nullable': False}
         """
 
-        if min_value in (SchemaDefs.CRR_DATE, SchemaDefs.CRR_YEAR):
-            dtype = self.dtypes[field] if field in self.dtypes else "undefined"
-            try:
-                if dtype == "str":
-                    input_date = utils.convert_to_date(value)
-                elif dtype == "date":
-                    input_date = value
-                elif dtype == "datetime":
-                    input_date = value.date()
-                elif dtype == "int" and min_value == SchemaDefs.CRR_YEAR:
-                    input_date = dt(value, 1, 1).date()
-                else:
-                    message = f"{min_value} not supported for {dtype} datatype"
-                    self._error(field, ErrorDefs.INVALID_DATE_MIN, message)
-                    return
-            except (ValueError, TypeError, parser.ParserError) as error:
-                self._error(field, ErrorDefs.INVALID_DATE_MIN, str(error))
-                return
-
-            curr_date = dt.now().date()
-
-            if min_value == SchemaDefs.CRR_DATE and input_date < curr_date:
-                self._error(field, ErrorDefs.CURR_DATE_MIN, str(curr_date))
-            elif min_value == SchemaDefs.CRR_YEAR and input_date.year < curr_date.year:
-                self._error(field, ErrorDefs.CURR_YEAR_MIN, curr_date.year)
-        else:
-            if SchemaDefs.FORMATTING in self.schema[field]:
-                methodname = f"convert_to_{self.schema[field][SchemaDefs.FORMATTING]}"
-                func = getattr(utils, methodname, None)
-                if func and callable(func):
-                    try:
-                        min_value = func(min_value)
-                        value = func(value)
-                    except (
-                            AttributeError,
-                            parser.ParserError,
-                            TypeError,
-                            ValueError,
-                    ) as error:
-                        self._error(field, ErrorDefs.INVALID_DATE_MIN,
-                                    str(error))
-                        return
-                else:
-                    err_msg = f"{methodname} not defined in the validator module"
-                    self.__add_system_error(field, err_msg)
-                    raise ValidationException(err_msg)
-
-            super()._validate_min(min_value, field, value)
+        self.__validate_bound("min", min_value, field, value,
+                              super()._validate_min)
 
     def _validate_filled(self, filled: bool, field: str, value: object):
         """Custom method to check whether the 'filled' rule is met. This is
@@ -479,6 +883,42 @@ class NACCValidator(Validator):
         elif filled and value is None:
             self._error(field, ErrorDefs.FILLED_TRUE)
 
+    def __get_subvalidator(self, field: str,
+                           conds: Mapping) -> "NACCValidator":
+        """Get the temporary validator for a field's set of conditions. The
+        validators are created once per condition definition and reused for
+        each record.
+
+        Args:
+            field: Variable name
+            conds: Conditions specified for the variable
+
+        Returns:
+            NACCValidator: Validator for the {field: conds} subschema
+        """
+        # the conditions are kept in the entry so that the id is not reused
+        key = (field, id(conds))
+        cached = self.__subvalidators.get(key)
+        if cached and cached[0] is conds:
+            temp_validator = cached[1]
+            temp_validator.reset_sys_errors()
+            temp_validator.reset_record_cache()
+        else:
+            subschema = {field: conds}
+            temp_validator = NACCValidator(
+                subschema,
+                allow_unknown=True,
+                error_handler=CustomErrorHandler(subschema),
+            )
+            self.__subvalidators[key] = (conds, temp_validator)
+
+        # pass the same datastore
+        if self.primary_key and self.datastore:
+            temp_validator.primary_key = self.primary_key
+            temp_validator.datastore = self.datastore
+
+        return temp_validator
+
     def _check_subschema_valid(
             self,
             all_conditions: Dict[str, object],
@@ -498,41 +938,142 @@ class NACCValidator(Validator):
         if not record:
             record = self.document
 
-        valid = operator != "OR"
-        errors = {}
+        get_subvalidator = self.__get_subvalidator
+        if operator == "OR":
+            # Evaluate the cheapest conditions first
+            failed = []
+            for position, field, conds in self.__get_rule_plan(
+                    all_conditions, self.__plan_or_conditions):
+                temp_validator = get_subvalidator(field, conds)
+                # if something passed, don't need to evaluate rest,
+                # and ignore any errors found
+                if temp_validator.validate(_ConditionRecord(record, (field, )),
+                                           normalize=False):
+                    return True, None
+                failed.append((position, temp_validator))
+
+            # otherwise report all errors, in the order of the conditions
+            errors = {}
+            for _, temp_validator in sorted(failed, key=itemgetter(0)):
+                errors.update(temp_validator.errors)
+            return False, errors
 
+        # Evaluate as logical AND operation, the temporary validators only
+        # walk their own field of the record
         for field, conds in all_conditions.items():
-            subschema = {field: conds}
+            temp_validator = get_subvalidator(field, conds)
+            if not temp_validator.validate(_ConditionRecord(record, (field, )),
+                                           normalize=False):
+                return False, temp_validator.errors
 
-            temp_validator = NACCValidator(
-                subschema,
-                allow_unknown=True,
-                error_handler=CustomErrorHandler(subschema),
-            )
+        return True, {}
 
-            # pass the same datastore
-            if self.primary_key and self.datastore:
-                temp_validator.primary_key = self.primary_key
-                temp_validator.datastore = self.datastore
+    def __get_rule_plan(self, rules: Union[List[Mapping], Mapping],
+                        planner: Callable[[Any], Any]) -> Any:
+        """Get the normalized form of a list of compatibility/temporal rules,
+        a set of conditions or a logic formula. The rules are normalized once
+        per rule definition and reused for each record.
 
-            if operator == "OR":
-                valid = valid or temp_validator.validate(record,
-                                                         normalize=False)
-                # if something passed, don't need to evaluate rest,
-                # and ignore any errors found
-                if valid:
-                    errors = None
-                    break
-                # otherwise keep track of all errors
-                errors.update(temp_validator.errors)
+        Args:
+            rules: List of rules specified for a variable, set of conditions
+                or logic formula
+            planner: Method to normalize (or compile) the rules
+
+        Returns:
+            Any: Normalized rules
+        """
+        # the rules are kept in the entry so that the id is not reused
+        cached = self.__rule_plans.get(id(rules))
+        if cached and cached[0] is rules:
+            return cached[1]
+
+        plan = planner(rules)
+        self.__rule_plans[id(rules)] = (rules, plan)
+        return plan
+
+    @staticmethod
+    def __plan_or_conditions(all_conditions: Mapping) -> List[Tuple]:
+        """Order the conditions of an OR clause, conditions with rules that
+        need other validators, the datastore or formula evaluation last.
+
+        Args:
+            all_conditions: Set of conditions to be validated
+
+        Returns:
+            List[Tuple]: (position, field, conds) for each condition
+        """
+        return sorted(
+            ((position, field, conds)
+             for position, (field, conds) in enumerate(all_conditions.items())),
+            key=lambda item: not _COSTLY_RULES.isdisjoint(item[2]))
+
+    @staticmethod
+    def __plan_compatibility(
+            constraints: List[Mapping]) -> Tuple[_CompatPlan, ...]:
+        """Normalize the compatibility constraints.
+
+        Args:
+            constraints: List of constraints specified for a variable
+
+        Returns:
+            Tuple[_CompatPlan, ...]: Normalized constraints
+        """
+        plan = []
+        rule_no = -1
+        for constraint in constraints:
+            # Extract constraint index if specified, or increment by 1
+            rule_no = constraint.get(SchemaDefs.INDEX, rule_no + 1)
+
+            # Extract operators if specified, default is AND, and the
+            # conditions for each clause, else clause is optional
+            plan.append(_CompatPlan(
+                rule_no,
+                constraint.get(SchemaDefs.IF_OP, "AND").upper(),
+                constraint.get(SchemaDefs.THEN_OP, "AND").upper(),
+                constraint.get(SchemaDefs.ELSE_OP, "AND").upper(),
+                constraint[SchemaDefs.IF],
+                constraint[SchemaDefs.THEN],
+                constraint.get(SchemaDefs.ELSE, None),
+            ))
+
+        return tuple(plan)
+
+    @staticmethod
+    def __plan_temporalrules(
+            temporalrules: List[Mapping]) -> Tuple[_TemporalPlan, ...]:
+        """Normalize the temporal rules.
+
+        Args:
+            temporalrules: List of temporal rules specified for a variable
+
+        Returns:
+            Tuple[_TemporalPlan, ...]: Normalized temporal rules
+        """
+        plan = []
+        rule_no = -1
+        for temporalrule in temporalrules:
+            rule_no = temporalrule.get(SchemaDefs.INDEX, rule_no + 1)
 
-            # Evaluate as logical AND operation
-            elif not temp_validator.validate(record, normalize=False):
-                valid = False
-                errors = temp_validator.errors
-                break
+            ignore_empty_fields = temporalrule.get(SchemaDefs.IGNORE_EMPTY)
+            if isinstance(ignore_empty_fields, str):
+                ignore_empty_fields = (ignore_empty_fields, )
+            elif ignore_empty_fields:
+                ignore_empty_fields = tuple(ignore_empty_fields)
+            else:
+                ignore_empty_fields = None
 
-        return valid, errors
+            # Extract operators if specified, default is AND
+            plan.append(_TemporalPlan(
+                rule_no,
+                temporalrule.get(SchemaDefs.SWAP_ORDER, False),
+                ignore_empty_fields,
+                temporalrule.get(SchemaDefs.PREV_OP, "AND").upper(),
+                temporalrule.get(SchemaDefs.CURR_OP, "AND").upper(),
+                temporalrule[SchemaDefs.PREVIOUS],
+                temporalrule[SchemaDefs.CURRENT],
+            ))
+
+        return tuple(plan)
 
     # pylint: disable=(too-many-locals, unused-argument)
     def _validate_compatibility(self, constraints: List[Mapping], field: str,
@@ -594,52 +1135,32 @@ class NACCValidator(Validator):
 
         # Evaluate each constraint in the List individually,
         # validation fails if any of the constraints fails.
-        rule_no = -1
-        for constraint in constraints:
-            # Extract operators if specified, default is AND
-            if_operator = constraint.get(SchemaDefs.IF_OP, "AND").upper()
-            then_operator = constraint.get(SchemaDefs.THEN_OP, "AND").upper()
-            else_operator = constraint.get(SchemaDefs.ELSE_OP, "AND").upper()
-
-            # Extract constraint index if specified, or increment by 1
-            rule_no = constraint.get(SchemaDefs.INDEX, rule_no + 1)
-
-            # Extract conditions for if clause
-            if_conds = constraint[SchemaDefs.IF]
-
-            # Extract conditions for then clause
-            then_conds = constraint[SchemaDefs.THEN]
-
-            # Extract conditions for else clause, this is optional
-            else_conds = constraint.get(SchemaDefs.ELSE, None)
-
+        for (rule_no, if_operator, then_operator, else_operator, if_conds,
+             then_conds, else_conds) in self.__get_rule_plan(
+                 constraints, self.__plan_compatibility):
             # Check if dependencies satisfied the If clause
-            error_def = ErrorDefs.COMPATIBILITY
-            errors = None
             valid, _ = self._check_subschema_valid(if_conds, if_operator)
 
             # If the If clause valid, validate the Then clause
             if valid:
                 valid, errors = self._check_subschema_valid(
                     then_conds, then_operator)
+                error_def, result_conds = ErrorDefs.COMPATIBILITY, then_conds
 
             # Otherwise validate the else clause, if they exist
             elif else_conds:
                 valid, errors = self._check_subschema_valid(
                     else_conds, else_operator)
                 error_def = ErrorDefs.COMPATIBILITY_ELSE
+                result_conds = else_conds
             else:  # if the If condition is not satisfied, do nothing
-                pass
+                continue
 
             # Something in the then/else clause failed - report errors
-            if errors:
+            if not valid and errors:
                 for error in errors.items():
-                    if error_def == ErrorDefs.COMPATIBILITY:
-                        self._error(field, error_def, rule_no, str(error),
-                                    if_conds, then_conds)
-                    else:
-                        self._error(field, error_def, rule_no, str(error),
-                                    if_conds, else_conds)
+                    self._error(field, error_def, rule_no, error,
+                                if_conds, result_conds)
 
     # pylint: disable=(too-many-locals)
     def _validate_temporalrules(self, temporalrules: List[Mapping], field: str,
@@ -710,16 +1231,10 @@ class NACCValidator(Validator):
                 }
             }
         """
-        rule_no = -1
-        for temporalrule in temporalrules:
-            swap_order = temporalrule.get(SchemaDefs.SWAP_ORDER, False)
-            ignore_empty_fields = temporalrule.get(SchemaDefs.IGNORE_EMPTY,
-                                                   None)
-            rule_no = temporalrule.get(SchemaDefs.INDEX, rule_no + 1)
-
-            if isinstance(ignore_empty_fields, str):
-                ignore_empty_fields = [ignore_empty_fields]
-
+        for (rule_no, swap_order, ignore_empty_fields, prev_operator,
+             curr_operator, prev_conds,
+             curr_conds) in self.__get_rule_plan(temporalrules,
+                                                 self.__plan_temporalrules):
             prev_ins = self.__get_previous_record(
                 field=field, ignore_empty_fields=ignore_empty_fields)
 
@@ -732,13 +1247,6 @@ class NACCValidator(Validator):
                 self._error(field, ErrorDefs.NO_PREV_VISIT, rule_no)
                 return
 
-            # Extract operators if specified, default is AND
-            prev_operator = temporalrule.get(SchemaDefs.PREV_OP, "AND").upper()
-            curr_operator = temporalrule.get(SchemaDefs.CURR_OP, "AND").upper()
-
-            prev_conds = temporalrule[SchemaDefs.PREVIOUS]
-            curr_conds = temporalrule[SchemaDefs.CURRENT]
-
             # default order of operations is to first check if conditions for
             # previous visit is satisfied, then current visit, but
             # occasionally we need to swap that order
@@ -776,7 +1284,7 @@ class NACCValidator(Validator):
             # Cross visit validation failed - report errors
             if not valid and errors:
                 for error in errors.items():
-                    self._error(field, error_def, rule_no, str(error),
+                    self._error(field, error_def, rule_no, error,
                                 prev_conds, curr_conds)
 
     def _validate_logic(self, logic: Dict[str, Any], field: str,
@@ -806,7 +1314,8 @@ class NACCValidator(Validator):
         if not err_msg:
             err_msg = f"value {value} does not satisfy the specified formula"
         try:
-            if not jsonLogic(formula, self.document):
+            rule = self.__get_rule_plan(formula, compile_rule)
+            if not rule(_full_record(self.document)):
                 self._error(field, ErrorDefs.FORMULA, err_msg)
         except ValueError as error:
             self._error(field, ErrorDefs.FORMULA, str(error))
@@ -833,8 +1342,12 @@ class NACCValidator(Validator):
             }
         """
 
-        function_name = '_' + \
-            function.get(SchemaDefs.FUNCTION_NAME, 'undefined')
+        name = function.get(SchemaDefs.FUNCTION_NAME, 'undefined')
+        try:
+            function_name = _FUNCTION_NAMES[name]
+        except KeyError:
+            function_name = _FUNCTION_NAMES.setdefault(name, '_' + name)
+
         func = getattr(self, function_name, None)
         if func and callable(func):
             kwargs = function.get(SchemaDefs.FUNCTION_ARGS, {})
@@ -864,26 +1377,36 @@ class NACCValidator(Validator):
             }
         """
 
-        nogds = 0
-        if "nogds" in self.document:
-            nogds = self.document["nogds"]
-
-        num_valid = 0
-        gds = 0
-        for key in keys:
-            if key in self.document and self.document[key] in [1, 0]:
-                num_valid += 1
-                gds += self.document[key]
+        get = self.document.get
+        nogds = get("nogds", 0)
 
         if nogds == 1:
             if value != 88:
                 self._error(field, ErrorDefs.CHECK_GDS_1, 0)
 
-            if num_valid >= 12:
-                self._error(field, ErrorDefs.CHECK_GDS_2, 1)
+            # only need to know whether 12 or more questions were answered
+            num_valid = 0
+            for key in keys:
+                answer = get(key)
+                if answer == 1 or answer == 0:
+                    num_valid += 1
+                    if num_valid >= 12:
+                        self._error(field, ErrorDefs.CHECK_GDS_2, 1)
+                        break
 
             return
 
+        # count the answered (0/1) questions, and sum up the 1s
+        num_valid = 0
+        gds = 0
+        for key in keys:
+            answer = get(key)
+            if answer == 1:
+                num_valid += 1
+                gds += answer
+            elif answer == 0:
+                num_valid += 1
+
         # commenting this out for now in case we revert back
         # if num_valid == 15 and gds != value:
         #     self._error(field, ErrorDefs.CHECK_GDS_3, 2, value, gds)
@@ -955,24 +1478,17 @@ class NACCValidator(Validator):
             }
         """
 
+        get = comparison.get
         comparator = comparison[SchemaDefs.COMPARATOR]
         base = comparison[SchemaDefs.BASE]
-        adjustment = comparison.get(SchemaDefs.ADJUST, None)
-        operator = comparison.get(SchemaDefs.OP, None)
+        adjustment = get(SchemaDefs.ADJUST, None)
+        operator = get(SchemaDefs.OP, None)
 
-        prev_record = comparison.get(SchemaDefs.PREV_RECORD, False)
-        ignore_empty = comparison.get(SchemaDefs.IGNORE_EMPTY, False)
-
-        base_str = f'{base} (previous record)' if prev_record else base
-        comparison_str = f'{field} {comparator} {base_str}'
-        if adjustment and operator:
-            if operator == 'abs':
-                comparison_str = f'abs({field} - {base_str}) {comparator} {adjustment}'
-            else:
-                comparison_str += f' {operator} {adjustment}'
+        prev_record = get(SchemaDefs.PREV_RECORD, False)
+        ignore_empty = get(SchemaDefs.IGNORE_EMPTY, False)
 
         if prev_record:
-            ignore_empty_fields = [base] if ignore_empty else None
+            ignore_empty_fields = (base, ) if ignore_empty else None
             record = self.__get_previous_record(
                 field=base, ignore_empty_fields=ignore_empty_fields)
             # pass through validation if no records found and ignore_empty is True
@@ -986,30 +1502,53 @@ class NACCValidator(Validator):
         if base_val is None:
             error = (ErrorDefs.COMPARE_WITH_PREV
                      if prev_record else ErrorDefs.COMPARE_WITH)
-            self._error(field, error, comparison_str)
+            self._error(field, error,
+                        self.__describe_comparison(field, comparison))
             return
 
         try:
             adjusted_value = base_val
             if adjustment and operator:
                 adjustment = self.__get_value_for_key(adjustment)
-                if operator == "+":
-                    adjusted_value = base_val + adjustment
-                elif operator == "-":
-                    adjusted_value = base_val - adjustment
-                elif operator == "*":
-                    adjusted_value = base_val * adjustment
-                elif operator == "/":
-                    adjusted_value = base_val / adjustment
-                elif operator == "abs":
+                if operator == "abs":
                     value = abs(value - base_val)
                     adjusted_value = adjustment
+                elif operator in _ADJUSTMENTS:
+                    adjusted_value = _ADJUSTMENTS[operator](base_val,
+                                                           adjustment)
 
             valid = utils.compare_values(comparator, value, adjusted_value)
-            if not valid:
-                self._error(field, ErrorDefs.COMPARE_WITH, comparison_str)
         except (TypeError, ValueError):
-            self._error(field, ErrorDefs.COMPARE_WITH, comparison_str)
+            valid = False
+
+        if not valid:
+            self._error(field, ErrorDefs.COMPARE_WITH,
+                        self.__describe_comparison(field, comparison))
+
+    @staticmethod
+    def __describe_comparison(field: str, comparison: Mapping) -> str:
+        """Describe a compare_with comparison for the error message, only
+        built when the comparison fails.
+
+        Args:
+            field: Variable name
+            comparison: Comparison specified in the rule definition
+
+        Returns:
+            str: Comparison as a string, e.g. "age > base + 1"
+        """
+        comparator = comparison[SchemaDefs.COMPARATOR]
+        base = comparison[SchemaDefs.BASE]
+        adjustment = comparison.get(SchemaDefs.ADJUST, None)
+        operator = comparison.get(SchemaDefs.OP, None)
+
+        if comparison.get(SchemaDefs.PREV_RECORD, False):
+            base = f'{base} (previous record)'
+        if adjustment and operator:
+            if operator == 'abs':
+                return f'abs({field} - {base}) {comparator} {adjustment}'
+            return f'{field} {comparator} {base} {operator} {adjustment}'
+        return f'{field} {comparator} {base}'
 
     def _check_with_rxnorm(self, field: str, value: Optional[int]):
         """Check whether the specified value is a valid RXCUI
@@ -1033,7 +1572,7 @@ class NACCValidator(Validator):
             self.__add_system_error(field, err_msg)
             raise ValidationException(err_msg)
 
-        if not self.datastore.is_valid_rxcui(value):
+        if not self.datastore.is_valid_rxcui_cached(value):
             self._error(field, ErrorDefs.RXNORM, value)
 
     def _validate_compare_age(self, comparison: Dict[str, Any], field: str,
@@ -1103,9 +1642,6 @@ class NACCValidator(Validator):
             self._error(field, ErrorDefs.DATE_CONVERSION, value, error)
             return
 
-        comparison_str = \
-            f'age at {field} {comparator} {", ".join(map(str, ages_to_compare))}'
-
         # calculates age at the value of this field given the
         # birth fields and assumes the ages_to_compare values to are also numerical
         birth_month = self.__get_value_for_key(
@@ -1115,17 +1651,19 @@ class NACCValidator(Validator):
         birth_year = self.__get_value_for_key(
             comparison[SchemaDefs.BIRTH_YEAR])
 
-        birth_date = utils.convert_to_date(f"{birth_month:02d} \
-                                           /{birth_day:02d} \
-                                           /{birth_year:04d}")
+        birth_date = date(birth_year, birth_month, birth_day)
         # age calculation is based off of how RT has defined it in A1
         age = (value - birth_date).days / 365.25
 
+        compare = utils.get_comparator(comparator)
+        get_value_for_key = self.__get_value_for_key
         for compare_field in ages_to_compare:
-            compare_value = self.__get_value_for_key(compare_field)
+            compare_value = get_value_for_key(compare_field)
             try:
-                valid = utils.compare_values(comparator, age, compare_value)
+                valid = compare(age, compare_value)
                 if not valid:
+                    comparison_str = f'age at {field} {comparator} ' \
+                        f'{", ".join(map(str, ages_to_compare))}'
                     self._error(field, ErrorDefs.COMPARE_AGE, compare_field,
                                 comparison_str)
             except TypeError as error:
@@ -1149,7 +1687,7 @@ class NACCValidator(Validator):
             self.__add_system_error(field, err_msg)
             raise ValidationException(err_msg)
 
-        if not self.datastore.is_valid_adcid(value, own):
+        if not self.datastore.is_valid_adcid_cached(value, own):
             self._error(
                 field, ErrorDefs.ADCID_NOT_MATCH
                 if own else ErrorDefs.ADCID_NOT_VALID, value)
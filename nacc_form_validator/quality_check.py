@@ -1,13 +1,14 @@
 """Module for performing data quality checks."""
 
-from typing import Dict, List, Mapping, Optional, Tuple
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
 
 from cerberus.errors import DocumentErrorTree
 from cerberus.schema import SchemaError
 
 from nacc_form_validator.datastore import Datastore
 from nacc_form_validator.errors import CustomErrorHandler
-from nacc_form_validator.nacc_validator import NACCValidator, ValidationException
+from nacc_form_validator.nacc_validator import NACCValidator
+from nacc_form_validator.schema_compiler import CompiledSchema, compile_schema
 
 
 class QualityCheckException(Exception):
@@ -43,6 +44,12 @@ class QualityCheck:
         self.__validator: NACCValidator = None
         self.__init_validator(datastore)
 
+        # Compiled pass/fail check for the schema, set by compile()
+        self.__compiled: Optional[CompiledSchema] = None
+
+        # Whether compile() was called, the schema may not be compilable
+        self.__compile_attempted: bool = False
+
     @property
     def pk_field(self) -> str:
         """primary key field.
@@ -94,6 +101,21 @@ class QualityCheck:
         self.validator.primary_key = self.pk_field
         self.validator.datastore = datastore
 
+    def compile(self) -> bool:
+        """Compile the schema into a function which checks whether a record
+        passes all the rules. Once compiled, validate_record only runs the
+        validator for the records rejected by the compiled function.
+
+        Returns:
+            bool: True if the schema was compiled, False if the schema has
+                  rules which can only be evaluated by the validator
+        """
+        self.__compiled = compile_schema(self.schema,
+                                         self.validator.types_mapping,
+                                         allow_unknown=not self.__strict)
+        self.__compile_attempted = True
+        return self.__compiled is not None
+
     def validate_record(
         self, record: Dict[str, str]
     ) -> Tuple[bool, bool, Dict[str, List[str]], DocumentErrorTree]:
@@ -111,24 +133,28 @@ class QualityCheck:
         """
 
         # All the fields in the input record represented as string values,
-        # cast the fields to appropriate data types according to the schema
-        cst_record = self.validator.cast_record(record.copy())
+        # the validator casts them to appropriate data types according to the
+        # schema
+        return next(self.validator.validate_many((record, ), self.__compiled))
+
+    def validate_records(
+        self, records: Iterable[Dict[str, str]]
+    ) -> Iterator[Tuple[bool, bool, Dict[str, List[str]], DocumentErrorTree]]:
+        """Evaluate a batch of records against the defined rules. Compiles the
+        schema first if compile() has not been called yet. The records
+        accepted by the compiled schema (if any) pass straight away and the
+        others are validated in full to collect their errors, see
+        NACCValidator.validate_many.
 
-        # Validate the record against the defined schema
-        sys_failure = False
-        passed = False
-        try:
-            self.validator.reset_sys_errors()
-            self.validator.reset_record_cache()
-            passed = self.validator.validate(cst_record, normalize=False)
-        except ValidationException:
-            sys_failure = True
-
-        if sys_failure:
-            errors = self.validator.sys_errors
-            error_tree = None
-        else:
-            errors = self.validator.errors
-            error_tree = self.validator.document_error_tree
-
-        return passed, sys_failure, errors, error_tree
+        Args:
+            records: Records to be validated, each as Dict[field, value]
+
+        Returns:
+            Iterator: validate_record results for each record, in the same
+            order as the input records
+        """
+
+        if not self.__compile_attempted:
+            self.compile()
+
+        return self.validator.validate_many(records, self.__compiled)
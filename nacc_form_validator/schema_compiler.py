@@ -0,0 +1,241 @@
+"""Module for compiling simple validation schemas into Python functions.
+
+The generated function only answers whether a (casted) record passes
+the schema, it does not collect any errors. It is meant to be used as a
+fast path in front of the cerberus validator, which still has to be
+used to report the errors of any record the compiled function rejects.
+"""
+
+import logging
+from collections.abc import Iterable, Mapping
+from typing import Callable, Dict, List, Optional
+
+from nacc_form_validator import utils
+from nacc_form_validator.keys import SchemaDefs
+
+log = logging.getLogger(__name__)
+
+# Rules the compiler can generate code for, a schema using any other rule
+# is not compiled and must be evaluated by the validator
+SUPPORTED_RULES = frozenset([
+    SchemaDefs.TYPE,
+    SchemaDefs.META,
+    "nullable",
+    "required",
+    "filled",
+    "min",
+    "max",
+    "allowed",
+    "forbidden",
+    "regex",
+])
+
+# Rules cerberus skips when the value is None (see Validator._validate_nullable)
+_NULLABLE_DROPPED_RULES = ("type", "min", "max", "allowed", "forbidden",
+                           "regex")
+
+CompiledSchema = Callable[[Mapping], bool]
+
+
+class _Unsupported(Exception):
+    """Raised when a field definition cannot be compiled."""
+
+
+class _SourceBuilder:
+    """Helper class to collect the generated source and its constants."""
+
+    def __init__(self):
+        self.lines: List[str] = []
+        self.namespace: Dict[str, object] = {
+            "_Iterable": Iterable,
+        }
+
+    def add_line(self, indent: int, line: str):
+        """Append a line of code to the generated source.
+
+        Args:
+            indent: Indentation level
+            line: Line of code
+        """
+        self.lines.append("    " * indent + line)
+
+    def add_constant(self, value: object) -> str:
+        """Bind a constant in the namespace of the generated function.
+
+        Args:
+            value: Constant value
+
+        Returns:
+            str: Name of the constant in the generated source
+        """
+        name = f"_c{len(self.namespace)}"
+        self.namespace[name] = value
+        return name
+
+
+def _as_container(values: object) -> object:
+    """Convert the allowed/forbidden values to a frozenset if possible.
+
+    Args:
+        values: Values specified in the schema
+
+    Returns:
+        object: frozenset of the values, or the values as is if not hashable
+    """
+    try:
+        return frozenset(values)
+    except TypeError:
+        return values
+
+
+def _type_check(builder: _SourceBuilder, data_type: object,
+                types_mapping: Mapping) -> str:
+    """Generate the expression for the type rule.
+
+    Args:
+        builder: Source builder
+        data_type: Type or list of types specified in the schema
+        types_mapping: Validator's cerberus type name -> TypeDefinition map
+
+    Returns:
+        str: Expression which is True if the value `v` matches the type
+
+    Raises:
+        _Unsupported: If a type has no cerberus type definition
+    """
+    types = (data_type, ) if isinstance(data_type, str) else data_type
+    checks = []
+    for type_name in types:
+        type_def = types_mapping.get(type_name)
+        if type_def is None:
+            raise _Unsupported(f"type {type_name}")
+
+        check = f"isinstance(v, {builder.add_constant(type_def.included_types)})"
+        if type_def.excluded_types:
+            excluded = builder.add_constant(type_def.excluded_types)
+            check += f" and not isinstance(v, {excluded})"
+        checks.append(f"({check})")
+
+    return " or ".join(checks)
+
+
+def _compile_field(builder: _SourceBuilder, field: str, rules: Mapping,
+                   types_mapping: Mapping):
+    """Generate the code to validate a single field.
+
+    Args:
+        builder: Source builder
+        field: Variable name
+        rules: Rule definitions for the field
+        types_mapping: Validator's cerberus type name -> TypeDefinition map
+
+    Raises:
+        _Unsupported: If the field uses a rule the compiler can't handle
+    """
+    unsupported = set(rules) - SUPPORTED_RULES
+    if unsupported:
+        raise _Unsupported(", ".join(sorted(unsupported)))
+
+    key = builder.add_constant(field)
+    if rules.get("required"):
+        builder.add_line(1, f"if {key} not in record:")
+        builder.add_line(2, "return False")
+
+    builder.add_line(1, f"if {key} in record:")
+    builder.add_line(2, f"v = record[{key}]")
+
+    filled = rules.get("filled")
+    if filled is True:
+        builder.add_line(2, "if v is None:")
+        builder.add_line(3, "return False")
+    elif filled is False:
+        builder.add_line(2, "if v is not None:")
+        builder.add_line(3, "return False")
+
+    builder.add_line(2, "if v is None:")
+    builder.add_line(3, "pass" if rules.get("nullable") else "return False")
+
+    if not any(rule in rules for rule in _NULLABLE_DROPPED_RULES):
+        return
+
+    builder.add_line(2, "else:")
+    if rules.get(SchemaDefs.TYPE):
+        builder.add_line(
+            3,
+            f"if not ({_type_check(builder, rules[SchemaDefs.TYPE], types_mapping)}):"
+        )
+        builder.add_line(4, "return False")
+
+    for rule, comparison in (("min", "<"), ("max", ">")):
+        if rule not in rules:
+            continue
+        # current_date/current_year and formatted values are NACC specific
+        bound = rules[rule]
+        if isinstance(bound, bool) or not isinstance(bound, (int, float)):
+            raise _Unsupported(f"{rule} {bound}")
+        builder.add_line(3, "try:")
+        builder.add_line(
+            4, f"if v {comparison} {builder.add_constant(bound)}:")
+        builder.add_line(5, "return False")
+        builder.add_line(3, "except TypeError:")
+        builder.add_line(4, "pass")
+
+    if "allowed" in rules or "forbidden" in rules:
+        # containers are validated item by item, leave those to the validator
+        builder.add_line(
+            3, "if isinstance(v, _Iterable) and not isinstance(v, str):")
+        builder.add_line(4, "return False")
+    if "allowed" in rules:
+        allowed = builder.add_constant(_as_container(rules["allowed"]))
+        builder.add_line(3, f"if v not in {allowed}:")
+        builder.add_line(4, "return False")
+    if "forbidden" in rules:
+        forbidden = builder.add_constant(_as_container(rules["forbidden"]))
+        builder.add_line(3, f"if v in {forbidden}:")
+        builder.add_line(4, "return False")
+
+    if "regex" in rules:
+        regex = builder.add_constant(utils.compile_regex(rules["regex"]))
+        builder.add_line(3, f"if isinstance(v, str) and not {regex}.match(v):")
+        builder.add_line(4, "return False")
+
+
+def compile_schema(schema: Mapping[str, Mapping],
+                   types_mapping: Mapping,
+                   allow_unknown: bool = False) -> Optional[CompiledSchema]:
+    """Compile the schema into a function that checks whether a record passes
+    all the rules. Only schemas consisting of the SUPPORTED_RULES can be
+    compiled.
+
+    Args:
+        schema: Validation schema as Dict[field, rule objects]
+        types_mapping: Validator's cerberus type name -> TypeDefinition map
+        allow_unknown (optional): Whether unknown fields are allowed
+
+    Returns:
+        CompiledSchema: Function returning True if the record passed all the
+            rules, or None if the schema can't be compiled
+    """
+
+    builder = _SourceBuilder()
+    builder.add_line(0, "def validate(record):")
+
+    if not allow_unknown:
+        fields = builder.add_constant(frozenset(schema))
+        builder.add_line(1, f"if not {fields}.issuperset(record):")
+        builder.add_line(2, "return False")
+
+    for field, rules in schema.items():
+        try:
+            _compile_field(builder, field, rules, types_mapping)
+        except _Unsupported as error:
+            log.debug("Cannot compile schema, unsupported rule for %s: %s",
+                      field, error)
+            return None
+
+    builder.add_line(1, "return True")
+
+    code = compile("\n".join(builder.lines), "<nacc_schema>", "exec")
+    exec(code, builder.namespace)  # pylint: disable=(exec-used)
+
+    return builder.namespace["validate"]
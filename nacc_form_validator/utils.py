@@ -2,29 +2,86 @@
 
 import logging
 import math
+import operator
 import re
-from typing import Any
+from datetime import date, datetime
+from functools import lru_cache
+from typing import Any, Callable, Dict, Optional
 
 from dateutil import parser
 
 log = logging.getLogger(__name__)
 
+# YYYY-MM-DD or YYYY/MM/DD
+YEARFIRST_DATE_PATTERN = re.compile(r"^\d{4}[-/]\d{2}[-/]\d{2}$")
 
-def convert_to_date(value) -> Any:
-    """Convert the input value to date object.
+# MM/DD/YYYY or MM-DD-YYYY
+MONTHFIRST_DATE_PATTERN = re.compile(r"^\d{2}[-/]\d{2}[-/]\d{4}$")
+
+
+def _parse_date_fast(value: str) -> Optional[date]:
+    """Parse the common fixed width date formats without dateutil.
 
     Args:
         value: value to convert
 
     Returns:
-        Any: date object or original value if conversion failed
+        Optional[date]: date object, or None if the value has to be parsed
+            by dateutil (other formats or swapped day/month)
     """
-    if not isinstance(value, str):
-        raise ValueError(
-            f'"convert to date" not supported for non string value {value}')
+    try:
+        if YEARFIRST_DATE_PATTERN.match(value):
+            return date(int(value[0:4]), int(value[5:7]), int(value[8:10]))
+        if MONTHFIRST_DATE_PATTERN.match(value):
+            return date(int(value[6:10]), int(value[0:2]), int(value[3:5]))
+    except ValueError:
+        pass
+
+    return None
+
+
+@lru_cache(maxsize=None)
+def compile_regex(pattern: str) -> re.Pattern:
+    """Compile a regex pattern specified in the schema. Patterns are compiled
+    once and reused, rather than relying on the size limited cache of the re
+    module. Same as cerberus, the pattern must match the full value.
+
+    Args:
+        pattern: regex pattern
+
+    Returns:
+        re.Pattern: compiled pattern
+    """
+    if not pattern.endswith("$"):
+        pattern += "$"
+
+    return re.compile(pattern)
+
+
+# Max number of distinct date strings to keep the parsed values for
+DATE_CACHE_SIZE = 4096
+
+
+@lru_cache(maxsize=DATE_CACHE_SIZE)
+def _parse_date(value: str) -> date:
+    """Parse a date string, results are cached since the same dates repeat
+    across records (e.g. birth and visit dates in longitudinal data).
+
+    Args:
+        value: value to convert
+
+    Returns:
+        date: date object
+
+    Raises:
+        ParserError: If the conversion failed
+    """
+    parsed = _parse_date_fast(value)
+    if parsed:
+        return parsed
 
     yearfirst = False
-    if re.match(r"^\d{4}[-/]\d{2}[-/]\d{2}$", value):
+    if YEARFIRST_DATE_PATTERN.match(value):
         yearfirst = True
 
     try:
@@ -33,23 +90,25 @@ def convert_to_date(value) -> Any:
         raise parser.ParserError(error) from error
 
 
-def convert_to_datetime(value) -> Any:
-    """Convert the input value to datetime object.
+@lru_cache(maxsize=DATE_CACHE_SIZE)
+def _parse_datetime(value: str) -> datetime:
+    """Parse a datetime string, results are cached same as _parse_date.
 
     Args:
         value: value to convert
 
     Returns:
-        Any: datetime object or original value if conversion failed
-    """
+        datetime: datetime object
 
-    if not isinstance(value, str):
-        raise ValueError(
-            f'"convert to datetime" not supported for non string value {value}'
-        )
+    Raises:
+        ParserError: If the conversion failed
+    """
+    parsed = _parse_date_fast(value)
+    if parsed:
+        return datetime(parsed.year, parsed.month, parsed.day)
 
     yearfirst = False
-    if re.match(r"^\d{4}[-/]\d{2}[-/]\d{2}$", value):
+    if YEARFIRST_DATE_PATTERN.match(value):
         yearfirst = True
 
     try:
@@ -58,60 +117,126 @@ def convert_to_datetime(value) -> Any:
         raise parser.ParserError(error) from error
 
 
-def compare_values(comparator: str, value: object, base_value: object) -> bool:
-    """Compare two values.
+def convert_to_date(value) -> Any:
+    """Convert the input value to date object.
 
     Args:
-        comparator: str, The comparator
-        value: The value being evaluated on
-        base_value: The value being evaluated against
+        value: value to convert
 
     Returns:
-        bool: True if the formula is satisfied, else False
+        Any: date object or original value if conversion failed
     """
-    # try close enough equality if both are floats first
-    both_floats = False
+    if not isinstance(value, str):
+        raise ValueError(
+            f'"convert to date" not supported for non string value {value}')
+
+    return _parse_date(value)
+
+
+def convert_to_datetime(value) -> Any:
+    """Convert the input value to datetime object.
+
+    Args:
+        value: value to convert
+
+    Returns:
+        Any: datetime object or original value if conversion failed
+    """
+
+    if not isinstance(value, str):
+        raise ValueError(
+            f'"convert to datetime" not supported for non string value {value}'
+        )
+
+    return _parse_datetime(value)
+
+
+def _equals(value: object, base_value: object) -> bool:
+    """Implements the == comparator, with close enough equality if both
+    values are numbers (or numeric strings)."""
     if isinstance(value, (str, int, float)) \
         and isinstance(base_value, (str, int, float)):
         try:
-            float(value)  # don't actually set it to a in case we die at b
-            float(base_value)
-            both_floats = True
+            return math.isclose(float(value), float(base_value), abs_tol=1e-2)
         except ValueError:
             pass
 
-    # test these first as they don't care about null values
-    if comparator == "==":
-        return value == base_value if not both_floats else \
-            math.isclose(float(value), float(base_value), abs_tol=1e-2)
+    return value == base_value
 
-    if comparator == "!=":
-        return value != base_value if not both_floats else \
-            not math.isclose(float(value), float(base_value), abs_tol=1e-2)
 
-    if comparator not in ["<=", ">=", "<", ">"]:
-        raise TypeError(f"Unrecognized comparator: {comparator}")
+def _not_equals(value: object, base_value: object) -> bool:
+    """Implements the != comparator, see _equals."""
+    return not _equals(value, base_value)
+
+
+def _ordering(compare: Callable[[Any, Any], bool], both_none: bool,
+              value_none: bool,
+              base_none: bool) -> Callable[[object, object], bool]:
+    """Creates the function for an ordering comparator (<, <=, >, >=).
+
+    Args:
+        compare: Comparison for two non-null values
+        both_none: Result when both values are None
+        value_none: Result when only the value is None
+        base_none: Result when only the base value is None
 
-    # for < and >, follow same convention as jsonlogic for null values
-    # for >= and <=, allow equality case (both None)
-    if value is None and base_value is None:
-        return True if comparator in ["<=", ">="] else False
-    if value is None:
-        return True if comparator in ["<", "<="] else False
-    if base_value is None:
-        return False if comparator in ["<", "<="] else True
+    Returns:
+        Callable[[object, object], bool]: Comparator function
+    """
+
+    def ordering(value: object, base_value: object) -> bool:
+        if value is None:
+            return both_none if base_value is None else value_none
+        if base_value is None:
+            return base_none
+        return compare(value, base_value)
+
+    return ordering
 
-    # now try as normal
-    if comparator == ">=":
-        return value >= base_value
 
-    if comparator == ">":
-        return value > base_value
+# Function implementing each comparator. ==/!= don't care about null values,
+# for < and >, follow same convention as jsonlogic for null values,
+# for >= and <=, allow equality case (both None)
+_COMPARATORS: Dict[str, Callable[[object, object], bool]] = {
+    "==": _equals,
+    "!=": _not_equals,
+    ">=": _ordering(operator.ge, True, False, True),
+    ">": _ordering(operator.gt, False, False, True),
+    "<=": _ordering(operator.le, True, True, False),
+    "<": _ordering(operator.lt, False, True, False),
+}
 
-    if comparator == "<=":
-        return value <= base_value
 
-    if comparator == "<":
-        return value < base_value
+def get_comparator(comparator: str) -> Callable[[object, object], bool]:
+    """Get the function to compare two values with the given comparator, so
+    that it can be resolved once when comparing several values.
+
+    Args:
+        comparator: str, The comparator
+
+    Returns:
+        Callable[[object, object], bool]: Function taking the value being
+            evaluated on and the value being evaluated against
+
+    Raises:
+        TypeError: If the comparator is not recognized
+    """
+    compare = _COMPARATORS.get(comparator)
+    if compare is None:
+        raise TypeError(f"Unrecognized comparator: {comparator}")
+
+    return compare
 
-    raise TypeError(f"Unrecognized comparator: {comparator}")
+
+def compare_values(comparator: str, value: object, base_value: object) -> bool:
+    """Compare two values.
+
+    Args:
+        comparator: str, The comparator
+        value: The value being evaluated on
+        base_value: The value being evaluated against
+
+    Returns:
+        bool: True if the formula is satisfied, else False
+    """
+    return get_comparator(comparator)(value, base_value)
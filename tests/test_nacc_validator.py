@@ -3,7 +3,8 @@ Tests general NACCValidator (from nacc_validator.py) methods
 """
 import pytest
 from dateutil import parser
-from nacc_form_validator.nacc_validator import ValidationException
+from nacc_form_validator.errors import CustomErrorHandler
+from nacc_form_validator.nacc_validator import NACCValidator, ValidationException
 
 
 def test_populate_data_types(nv):
@@ -56,6 +57,24 @@ def test_cast_record_invalid(nv):
         'dummy_datetime': 'invalid datetime'
     }
 
+def test_cast_record_typed(nv, caplog):
+    """ Test the cast_record method keeps values already of the expected type, and fills in missing fields """
+    date = parser.parse('01-01-2000').date()
+    record = {
+        'dummy_int': 10,
+        'dummy_date': date
+    }
+
+    assert nv.cast_record(record) == {
+        'dummy_int': 10,
+        'dummy_str': None,
+        'dummy_float': None,
+        'dummy_boolean': None,
+        'dummy_date': date,
+        'dummy_datetime': None
+    }
+    assert not caplog.records
+
 def test_validate_formatting_invalid_field(nv):
     """ Test _validate_formatting errors with invalid field - this is more
     of a test on getting system errors since its just a placeholder method """
@@ -69,6 +88,38 @@ def test_validate_formatting_invalid_field(nv):
         'dummy_int': ['formatting definition not supported for non string types']
     }
 
+def test_validate_function_undefined(create_nacc_validator):
+    """ Test a custom function that is not defined in the validator raises a system error every time """
+    schema = {"dummy_int": {"type": "integer", "function": {"name": "undefined_function"}}}
+    nv = create_nacc_validator(schema)
+
+    for _ in range(2):
+        with pytest.raises(ValidationException):
+            nv.validate({"dummy_int": 1})
+    assert nv.sys_errors == {
+        'dummy_int': ['_undefined_function not defined in the validator module'] * 2
+    }
+
+def test_validate_function_static_and_instance():
+    """ Test custom functions defined as staticmethods or attached to the validator instance """
+    calls = []
+
+    class StaticValidator(NACCValidator):
+        @staticmethod
+        def _check_static(field, value):
+            calls.append(('static', field, value))
+
+    schema = {"dummy_int": {"type": "integer", "function": {"name": "check_static"}}}
+    nv = StaticValidator(schema)
+    assert nv.validate({"dummy_int": 1})
+
+    schema = {"dummy_int": {"type": "integer", "function": {"name": "check_instance"}}}
+    nv = NACCValidator(schema)
+    nv._check_instance = lambda field, value: calls.append(('instance', field, value))
+    assert nv.validate({"dummy_int": 2})
+
+    assert calls == [('static', 'dummy_int', 1), ('instance', 'dummy_int', 2)]
+
 def test_lots_of_rules(create_nacc_validator):
     """ Test when a specific field has a lot of rules associated with it (in this case oldadcid) """
     schema = {
@@ -138,3 +189,47 @@ def test_lots_of_rules(create_nacc_validator):
     # invalid cases, logic (adcid != oldadcid)
     assert not nv.validate({'adcid': 0, 'prevenrl': 1, 'oldadcid': 0})
     assert nv.errors == {'oldadcid': ['error in formula evaluation - value 0 does not satisfy the specified formula']}
+
+def test_validate_many(nv):
+    """ Test casting and validating a batch of records """
+    records = [{'dummy_int': '10'}, {'dummy_int': 'ten'}, {'dummy_float': '1.5'}]
+    results = [(passed, errors) for passed, _, errors, _ in nv.validate_many(records)]
+
+    assert results == [
+        (True, {}),
+        (False, {'dummy_int': ['must be of integer type']}),
+        (True, {})
+    ]
+    assert records[0] == {'dummy_int': '10'}
+
+
+def test_validate_many_system_error(create_nacc_validator):
+    """ Test a system error is reported for its record and the batch carries on """
+    schema = {
+        'taxes': {
+            'nullable': True,
+            'type': 'integer',
+            'temporalrules': [{'previous': {'taxes': {'allowed': [0]}}, 'current': {'taxes': {'forbidden': [8]}}}]
+        }
+    }
+    nv = create_nacc_validator(schema)
+
+    results = list(nv.validate_many([{'taxes': '1'}, {'taxes': 'ten'}]))
+    assert results[0] == (False, True, {'taxes': ['Datastore not set, cannot validate temporal rules']}, None)
+    assert results[1][:3] == (False, False, {'taxes': ['must be of integer type']})
+
+
+def test_custom_error_messages_overridden():
+    """ Custom error messages are formatted from the error handler's own messages """
+    schema = {"dummy": {"nullable": True, "filled": True}}
+
+    class RenamedErrorHandler(CustomErrorHandler):
+        messages = {**CustomErrorHandler.messages, 0x1006: "must have a value"}
+
+    nv = NACCValidator(schema, allow_unknown=False, error_handler=RenamedErrorHandler(schema))
+    assert not nv.validate({"dummy": None})
+    assert nv.errors == {"dummy": ["must have a value"]}
+
+    nv.error_handler.messages = {**nv.get_error_messages(), 0x1006: "{field} must have a value"}
+    assert not nv.validate({"dummy": None})
+    assert nv.errors == {"dummy": ["dummy must have a value"]}
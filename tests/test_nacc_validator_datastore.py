@@ -9,6 +9,7 @@ import pytest
 from nacc_form_validator.datastore import Datastore
 from nacc_form_validator.errors import CustomErrorHandler
 from nacc_form_validator.nacc_validator import NACCValidator
+from nacc_form_validator.quality_check import QualityCheck
 
 
 class CustomDatastore(Datastore):
@@ -97,6 +98,35 @@ class CustomDatastore(Datastore):
         return adcid in self.__valid_adcids
 
 
+class CountingDatastore(CustomDatastore):
+    """ CustomDatastore recording the lookups made by the validator """
+
+    def __init__(self, pk_field: str, orderby: str) -> None:
+        self.rxcui_calls = []
+        self.rxcui_bulk_calls = []
+        self.nonempty_calls = 0
+        self.nonempty_fields = []
+        self.prev_bulk_calls = []
+        super().__init__(pk_field, orderby)
+
+    def is_valid_rxcui(self, drugid: int) -> bool:
+        self.rxcui_calls.append(drugid)
+        return super().is_valid_rxcui(drugid)
+
+    def are_valid_rxcuis(self, drugids: set[int]) -> set[int]:
+        self.rxcui_bulk_calls.append(sorted(drugids))
+        return super().are_valid_rxcuis(drugids)
+
+    def get_previous_nonempty_record(self, current_record: dict[str, str], fields: list[str]) -> dict[str, str] | None:
+        self.nonempty_calls += 1
+        self.nonempty_fields.append(fields)
+        return super().get_previous_nonempty_record(current_record, fields)
+
+    def get_previous_records(self, current_records: list[dict[str, str]]) -> list[dict[str, str] | None]:
+        self.prev_bulk_calls.append(len(current_records))
+        return super().get_previous_records(current_records)
+
+
 def create_nacc_validator_with_ds(schema: dict[str, object], pk_field: str, orderby: str) -> NACCValidator:
     """ Creates a generic NACCValidtor with the above CustomDataStore """
     nv = NACCValidator(schema,
@@ -403,3 +433,141 @@ def test_check_adcid():
     assert not nv.validate({"oldadcid": 20})
     assert nv.errors == {
         'oldadcid': ["Provided ADCID 20 is not in the valid list of ADCIDs"]}
+
+
+def test_check_with_rxnorm_cached():
+    """ Test drugID lookups are cached by the datastore across records """
+    schema = {
+        "drug": {
+            "type": "integer",
+            "check_with": "rxnorm"
+        }
+    }
+
+    nv = create_nacc_validator_with_ds(schema, 'patient_id', 'visit_num')
+    nv.datastore = CountingDatastore('patient_id', 'visit_num')
+
+    for _ in range(3):
+        assert nv.validate({"drug": 1})
+        assert not nv.validate({"drug": 100})
+
+    assert nv.datastore.rxcui_calls == [1, 100]
+
+    nv.datastore.clear_cache()
+    assert nv.validate({"drug": 1})
+    assert nv.datastore.rxcui_calls == [1, 100, 1]
+
+
+def test_check_with_datastore_without_super_init():
+    """ Test the drugID/ADCID checks work with a datastore that does not call Datastore.__init__ """
+    class PlainDatastore(CustomDatastore):
+        def __init__(self, pk_field: str, orderby: str) -> None:
+            self.pk_field = pk_field
+            self.orderby = orderby
+
+        def is_valid_rxcui(self, drugid: int) -> bool:
+            return drugid < 50
+
+        def is_valid_adcid(self, adcid: int, own: bool) -> bool:
+            return adcid == 0
+
+    schema = {
+        "drug": {
+            "type": "integer",
+            "nullable": True,
+            "check_with": "rxnorm"
+        },
+        "adcid": {
+            "type": "integer",
+            "nullable": True,
+            "function": {
+                "name": "check_adcid"
+            }
+        }
+    }
+
+    nv = create_nacc_validator_with_ds(schema, 'patient_id', 'visit_num')
+    nv.datastore = PlainDatastore('patient_id', 'visit_num')
+
+    assert nv.validate({"drug": 1, "adcid": 0})
+    assert not nv.validate({"drug": 100, "adcid": 1})
+    assert set(nv.errors) == {"drug", "adcid"}
+
+    nv.datastore = PlainDatastore('patient_id', 'visit_num')
+    results = [passed for passed, _, _, _ in nv.validate_many([{"drug": "1", "adcid": "0"}, {"drug": "100", "adcid": "0"}])]
+    assert results == [True, False]
+
+
+def test_validate_records_prefetch_rxcuis():
+    """ Test the drugIDs of a batch of records validated through QualityCheck are checked with one bulk lookup """
+    schema = {
+        "drug": {
+            "type": "integer",
+            "nullable": True,
+            "check_with": "rxnorm"
+        }
+    }
+
+    datastore = CountingDatastore('patient_id', 'visit_num')
+    qc = QualityCheck('patient_id', schema, datastore=datastore)
+
+    records = [{"drug": "1"}, {"drug": "100"}, {"drug": ""}, {"drug": "1"}]
+    results = [passed for passed, _, _, _ in qc.validate_records(records)]
+    assert results == [True, False, True, True]
+    assert datastore.rxcui_bulk_calls == [[1, 100]]
+    assert sorted(datastore.rxcui_calls) == [1, 100]
+
+
+def test_previous_nonempty_record_cached():
+    """ Test the previous non-empty record is only retrieved once per record for the same ignore_empty fields """
+    schema = {
+        "patient_id": {"type": "string"},
+        "visit_num": {"type": "integer"},
+        "taxes": {
+            "type": "integer",
+            "temporalrules": [
+                {
+                    "ignore_empty": ["birthmo", "birthdy"],
+                    "previous": {"birthmo": {"allowed": [6]}},
+                    "current": {"taxes": {"forbidden": [8]}}
+                },
+                {
+                    "ignore_empty": ["birthdy", "birthmo"],
+                    "previous": {"birthdy": {"allowed": [9]}},
+                    "current": {"taxes": {"forbidden": [9]}}
+                }
+            ]
+        }
+    }
+
+    nv = create_nacc_validator_with_ds(schema, 'patient_id', 'visit_num')
+    nv.datastore = CountingDatastore('patient_id', 'visit_num')
+
+    assert nv.validate({'patient_id': 'PatientID1', 'visit_num': 4, 'taxes': 1})
+    assert nv.datastore.nonempty_calls == 1
+    assert nv.datastore.nonempty_fields == [["birthmo", "birthdy"]]
+
+    nv.reset_record_cache()
+    assert not nv.validate({'patient_id': 'PatientID1', 'visit_num': 4, 'taxes': 9})
+    assert nv.errors == {'taxes': ["('taxes', ['unallowed value 9']) for if {'birthdy': {'allowed': [9]}} in previous visit then {'taxes': {'forbidden': [9]}} in current visit - temporal rule no: 1"]}
+    assert nv.datastore.nonempty_calls == 2
+
+
+def test_validate_records_prefetch_previous_records(schema):
+    """ Test the previous records of a batch validated through QualityCheck are retrieved at once, with the same results as validate_record """
+    datastore = CountingDatastore('patient_id', 'visit_num')
+    qc = QualityCheck('patient_id', schema, datastore=datastore)
+
+    records = [
+        {'patient_id': 'PatientID1', 'visit_num': '4', 'taxes': '1'},
+        {'patient_id': 'PatientID1', 'visit_num': '5', 'taxes': '8'},
+        {'patient_id': 'PatientID2', 'visit_num': '1', 'taxes': '1'},
+        {'visit_num': '1', 'taxes': '1'}
+    ]
+    results = [(passed, errors) for passed, _, errors, _ in qc.validate_records(records)]
+    assert datastore.prev_bulk_calls == [3]
+
+    expected = [(passed, errors) for passed, _, errors, _ in map(qc.validate_record, records)]
+    assert datastore.prev_bulk_calls == [3]
+    assert results == expected
+    assert [passed for passed, _ in results] == [True, False, False, False]
@@ -797,3 +797,32 @@ def test_compatibility_logic_with_divide(create_nacc_validator):
 
     assert not nv.validate({"ftdsnrat": 0.0 , "ftdhaird": 1, "ftdspit": 1, "ftdnose": 1})
     assert nv.errors == {'ftdsnrat': ["('ftdsnrat', ['unallowed value 0.0']) for if {'ftdhaird': {'allowed': [1]}, 'ftdspit': {'allowed': [1]}, 'ftdnose': {'allowed': [1]}} then {'ftdsnrat': {'allowed': [88.88]}} - compatibility rule no: 3"]}
+
+def test_compatibility_other_fields(create_nacc_validator):
+    """ Test that the conditions only check their own field, but can still refer to the other fields of the record """
+    schema = {
+        "mode": {"nullable": True, "type": "integer"},
+        "other": {"nullable": True, "type": "integer"},
+        "rmreason": {
+            "nullable": True,
+            "type": "integer",
+            "compatibility": [
+                {
+                    "if": {
+                        "mode": {"allowed": [2], "logic": {"formula": {"==": [{"var": "other"}, 1]}}}
+                    },
+                    "then": {
+                        "rmreason": {"nullable": False}
+                    }
+                }
+            ]
+        }
+    }
+    nv = create_nacc_validator(schema)
+
+    record = {"mode": 2, "other": 1, "rmreason": None}
+    assert not nv.validate(record)
+    assert record == {"mode": 2, "other": 1, "rmreason": None}
+    assert nv.validate({"mode": 2, "other": 0, "rmreason": None})
+    # the if condition passes when its field is not in the record
+    assert not nv.validate({"other": 1, "rmreason": None})
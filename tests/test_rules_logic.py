@@ -1,6 +1,11 @@
 """
 Tests the custom logic rule (_validate_logic) which uses json_logic.py.
 """
+import pytest
+
+from nacc_form_validator.json_logic import compile_rule, jsonLogic
+
+
 def test_logic_or(create_nacc_validator):
     """ Test mathematical logic or case """
     schema = {
@@ -296,3 +301,123 @@ def test_logic_count_exact_invalid_list(create_nacc_validator):
 
     assert not nv.validate({"count": 1})
     assert nv.errors == {'count': ['error in formula evaluation - count_exact needs a base and at least 1 value to compare to']}
+
+def test_logic_unrecognized_operation(create_nacc_validator):
+    """ Checking an error is thrown for an unknown operator """
+    schema = {
+        "count": {
+            "type": "integer",
+            "logic": {
+                "formula": {
+                    "==": [
+                        {
+                            "var": "count"
+                        },
+                        {
+                            "unknown": [1, 2]
+                        }
+                    ]
+                }
+            }
+        }
+    }
+    nv = create_nacc_validator(schema)
+
+    assert not nv.validate({"count": 1})
+    assert nv.errors == {'count': ['error in formula evaluation - Unrecognized operation unknown']}
+
+def test_logic_memoized_rules():
+    """ Checking rules referencing the data are re-evaluated while constant rules are memoized """
+    formula = {"and": [{"==": [{"var": "x"}, 1]}, {"<": [1, {"+": [1, 1]}]}]}
+    assert jsonLogic(formula, {"x": 1})
+    assert not jsonLogic(formula, {"x": 2})
+    assert jsonLogic(formula, {"x": 1})
+
+    merged = {"merge": [1, [2]]}
+    jsonLogic(merged).append(3)
+    assert jsonLogic(merged) == [1, 2]
+
+
+def test_logic_rule_modified_in_place():
+    """ Checking jsonLogic evaluates the current content of a rule modified in place """
+    formula = {"==": [{"var": "x"}, 1]}
+    assert jsonLogic(formula, {"x": 1})
+
+    formula["=="][1] = 2
+    assert not jsonLogic(formula, {"x": 1})
+    assert jsonLogic(formula, {"x": 2})
+
+
+def test_logic_compile_rule():
+    """ Checking a compiled rule can be evaluated against different data """
+    rule = compile_rule({"if": [{"missing": ["x"]}, "none", {">": [{"var": "x"}, {"*": [2, 3]}]}, "big", "small"]})
+    assert rule({}) == "none"
+    assert rule({"x": 7}) == "big"
+    assert rule({"x": 5}) == "small"
+
+    with pytest.raises(ValueError, match="Unrecognized operation unknown"):
+        compile_rule({"!": {"unknown": 1}})
+
+
+def test_logic_chained_comparison():
+    """ Checking chained comparisons compare each adjacent pair """
+    assert jsonLogic({"<": [1, {"var": "x"}, 3]}, {"x": 2})
+    assert not jsonLogic({"<": [1, {"var": "x"}, 3]}, {"x": 3})
+    assert jsonLogic({"<=": [1, {"var": "x"}, 3]}, {"x": 3})
+    assert not jsonLogic({"<=": [1, {"var": "x"}, 3]}, {"x": 4})
+
+    # mixed strings and numbers, '<' carries the coerced operand over
+    assert jsonLogic({"<": [1, "2", "10"]})
+    assert not jsonLogic({"<": [1, "2", "10", "9"]})
+    assert not jsonLogic({"<=": [1, "2", "10"]})
+
+
+def test_logic_in():
+    """ Checking the in operator for lists and strings """
+    rule = {"in": [{"var": "x"}, [1, 2, [3]]]}
+    assert jsonLogic(rule, {"x": 2})
+    assert jsonLogic(rule, {"x": 2.0})
+    assert jsonLogic(rule, {"x": [3]})
+    assert not jsonLogic(rule, {"x": "2"})
+    assert jsonLogic({"in": [{"var": "x"}, [1, 2]]}, {"x": 1})
+    assert jsonLogic({"in": ["b", {"var": "x"}]}, {"x": "abc"})
+    assert not jsonLogic({"in": ["b", {"var": "x"}]}, {"x": 1})
+
+
+def test_logic_missing():
+    """ Checking the missing and missing_some operators """
+    assert jsonLogic({"missing": ["a", "b", "c"]}, {"a": 1, "c": None}) == ["b"]
+    assert jsonLogic({"missing": [["a", "b.x"]]}, {"a": 1, "b": {"y": 1}}) == ["b.x"]
+    assert jsonLogic({"missing_some": [["a", "b", "c"], 2]}, {"a": 1}) == ["b", "c"]
+    assert jsonLogic({"missing_some": [["a", "b", "c"], 2]}, {"a": 1, "c": 1}) == []
+
+
+def test_logic_var_nested():
+    """ Checking nested variables and the default for the missing ones """
+    data = {"a": {"b": [1, 2]}, "c": None}
+    assert jsonLogic({"var": "a.b.1"}, data) == 2
+    assert jsonLogic({"var": ["a.b.2", "default"]}, data) == "default"
+    assert jsonLogic({"var": ["a.x", "default"]}, data) == "default"
+    assert jsonLogic({"var": ["c.x", "default"]}, data) == "default"
+    assert jsonLogic({"var": ["c", "default"]}, data) is None
+
+
+def test_logic_compile_rule_deeply_nested():
+    """ Checking rules nested deeper than a single generated expression allows """
+    rule = {"var": ["x", 0]}
+    for _ in range(200):
+        rule = {"+": [1, rule]}
+    compiled = compile_rule(rule)
+    assert compiled({}) == 200
+    assert compiled({"x": 5}) == 205
+
+
+def test_logic_short_circuit():
+    """ Checking and/or/if only evaluate the arguments needed for the result """
+    invalid = {"count_exact": [{"var": "x"}]}
+    assert jsonLogic({"and": [{"var": "x"}, invalid]}, {"x": 0}) == 0
+    assert jsonLogic({"or": [{"var": "x"}, invalid]}, {"x": 1}) == 1
+    assert jsonLogic({"if": [{"var": "x"}, "yes", invalid]}, {"x": 1}) == "yes"
+    assert jsonLogic({"if": [{"var": "x"}, "yes"]}, {"x": 0}) is None
+    with pytest.raises(ValueError):
+        jsonLogic({"and": [{"var": "x"}, invalid]}, {"x": 1})
@@ -0,0 +1,155 @@
+"""
+Tests compiling a schema into a pass/fail function (schema_compiler.py), and using it through QualityCheck.
+"""
+import pytest
+
+from nacc_form_validator.nacc_validator import NACCValidator
+from nacc_form_validator.quality_check import QualityCheck
+from nacc_form_validator.schema_compiler import compile_schema
+
+
+@pytest.fixture
+def schema(date_constraint):
+    return {
+        "ptid": {
+            "type": "string",
+            "required": True,
+            "meta": {"errmsg": "ptid is required"}
+        },
+        "age": {
+            "type": "integer",
+            "nullable": True,
+            "min": 0,
+            "max": 120
+        },
+        "score": {
+            "type": ["integer", "float"],
+            "nullable": True,
+            "allowed": [0, 1, 2.5]
+        },
+        "answer": {
+            "type": "integer",
+            "nullable": True,
+            "forbidden": [8, 9]
+        },
+        "visitdate": {
+            "type": "string",
+            "nullable": True,
+            "regex": date_constraint
+        },
+        "empty": {
+            "nullable": True,
+            "filled": False
+        },
+        "flag": {
+            "type": "boolean",
+            "nullable": True,
+            "filled": True
+        }
+    }
+
+
+@pytest.mark.parametrize("record", [
+    {"ptid": "1", "age": 10, "score": 1, "answer": 1, "visitdate": "01/01/2000", "empty": None, "flag": True},
+    {"ptid": "1", "age": None, "score": None, "answer": None, "visitdate": None, "empty": None, "flag": False},
+    {"ptid": "1", "age": 121, "flag": True},
+    {"ptid": "1", "age": -1, "flag": True},
+    {"ptid": "1", "age": "ten", "flag": True},
+    {"ptid": "1", "score": 2.5, "flag": True},
+    {"ptid": "1", "score": 2, "flag": True},
+    {"ptid": "1", "answer": 8, "flag": True},
+    {"ptid": "1", "visitdate": "2000/13/01", "flag": True},
+    {"ptid": "1", "empty": 1, "flag": True},
+    {"ptid": "1", "flag": None},
+    {"ptid": None, "flag": True},
+    {"flag": True},
+    {"ptid": "1", "flag": True, "unknown": 1},
+])
+def test_compiled_schema_matches_validator(schema, record):
+    """ The compiled function should pass/fail exactly the same records as the validator """
+    nv = NACCValidator(schema, allow_unknown=False)
+    compiled = compile_schema(schema, nv.types_mapping)
+    assert compiled is not None
+    assert compiled(record) == nv.validate(record, normalize=False)
+
+
+def test_compiled_schema_allow_unknown(schema):
+    """ Unknown fields are only rejected in strict mode """
+    nv = NACCValidator(schema, allow_unknown=True)
+    compiled = compile_schema(schema, nv.types_mapping, allow_unknown=True)
+    assert compiled({"ptid": "1", "flag": True, "unknown": 1})
+
+
+def test_compile_schema_unsupported(schema):
+    """ Schemas with NACC specific rules can't be compiled """
+    schema["age"]["max"] = "current_year"
+    nv = NACCValidator(schema, allow_unknown=False)
+    assert compile_schema(schema, nv.types_mapping) is None
+
+    schema["age"]["max"] = 120
+    schema["age"]["logic"] = {"formula": {"<": [{"var": "age"}, 100]}}
+    assert compile_schema(schema, nv.types_mapping) is None
+
+
+def test_quality_check_compile(schema):
+    """ Test validating records through QualityCheck with a compiled schema """
+    qc = QualityCheck("ptid", schema)
+    assert qc.compile()
+
+    passed, sys_failure, errors, error_tree = qc.validate_record({"ptid": "1", "age": "10", "flag": "1"})
+    assert passed and not sys_failure
+    assert errors == {}
+    assert not error_tree
+
+    passed, sys_failure, errors, _ = qc.validate_record({"ptid": "1", "age": "200", "flag": "1"})
+    assert not passed and not sys_failure
+    assert errors == {"age": ["max value is 120"]}
+
+    # the validator state of the failed record is cleared by the next record
+    passed, _, _, _ = qc.validate_record({"ptid": "1", "age": "10", "flag": "1"})
+    assert passed
+    assert qc.validator.errors == {}
+    assert not qc.validator.document_error_tree
+    assert qc.validator.sys_errors == {}
+
+
+def test_quality_check_validate_records(schema):
+    """ Test validating a batch of records through QualityCheck """
+    qc = QualityCheck("ptid", schema)
+    records = [{"ptid": "1", "flag": "1"}, {"ptid": "2", "age": "200", "flag": "1"}, {"ptid": "3", "flag": ""}]
+
+    results = [(passed, errors) for passed, _, errors, _ in qc.validate_records(records)]
+    assert results == [
+        (True, {}),
+        (False, {"age": ["max value is 120"]}),
+        (False, {"flag": ["cannot be empty"]})
+    ]
+
+
+def test_quality_check_validate_records_compiles_once(schema, monkeypatch):
+    """ An uncompilable schema is only compiled once, and each record is validated once """
+    schema["age"]["logic"] = {"formula": {"<": [{"var": "age"}, 100]}}
+    qc = QualityCheck("ptid", schema)
+
+    compile_calls = []
+
+    def counting_compile_schema(*args, **kwargs):
+        compile_calls.append(args)
+        return compile_schema(*args, **kwargs)
+
+    monkeypatch.setattr("nacc_form_validator.quality_check.compile_schema", counting_compile_schema)
+    validate_calls = []
+    validate = qc.validator.validate
+
+    def counting_validate(*args, **kwargs):
+        validate_calls.append(args)
+        return validate(*args, **kwargs)
+
+    monkeypatch.setattr(qc.validator, "validate", counting_validate)
+
+    for _ in range(2):
+        results = [passed for passed, _, _, _ in qc.validate_records([{"ptid": "1", "age": "10", "flag": "1"}, {"ptid": "2", "age": "110", "flag": "1"}])]
+        assert results == [True, False]
+
+    assert len(compile_calls) == 1
+    assert len(validate_calls) == 4
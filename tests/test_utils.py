@@ -17,6 +17,13 @@ def test_convert_to_date_yearfirst():
     date = '2001-01-01'
     assert convert_to_date(date) == parser.parse(date, yearfirst=True).date()
 
+def test_convert_to_date_fixed_width():
+    """ Test the fixed width formats give the same result as dateutil, including swapped day/month """
+    for date in ['02/03/2000', '2000/02/03', '2000-02-29', '13/02/2000']:
+        yearfirst = date.index('2000') == 0
+        assert convert_to_date(date) == parser.parse(date, yearfirst=yearfirst).date()
+        assert convert_to_datetime(date) == parser.parse(date, yearfirst=yearfirst)
+
 def test_convert_to_date_notstr():
     """ Test converting invalid type to a date """
     date = 2000
@@ -127,6 +134,18 @@ def test_compare_values_type_error():
         compare_values("<", "01/01/2000", parser.parse("01/01/2000"))
     assert str(e.value) == "'<' not supported between instances of 'str' and 'datetime.datetime'"
 
+def test_get_comparator():
+    """ Test resolving a comparator once and using it for several values """
+    compare = get_comparator("<=")
+    assert compare(1, 2)
+    assert compare(None, None)
+    assert not compare(5, None)
+    assert get_comparator("==")(1.33, 1.333333)
+
+    with pytest.raises(TypeError) as e:
+        get_comparator("*")
+    assert str(e.value) == "Unrecognized comparator: *"
+
 def test_compare_values_null_values_valid():
     """ Test comparing when at least one of the values is null """
     assert compare_values("==", None, None)
@@ -167,3 +186,10 @@ def test_compare_values_precision_tolerance():
 
     assert compare_values("!=", "3", "hello")
     assert not compare_values("==", 2.5, "hello")
+
+def test_compile_regex():
+    """ Test compiled regex patterns are reused and match the full value like cerberus """
+    pattern = compile_regex("^\\d{4}")
+    assert pattern is compile_regex("^\\d{4}")
+    assert pattern.match("2024")
+    assert not pattern.match("20245")
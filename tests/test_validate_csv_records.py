@@ -0,0 +1,39 @@
+"""
+Tests the example CSV validation script (docs/validate_csv_records.py).
+"""
+import csv
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+SCRIPT = ROOT / "docs" / "validate_csv_records.py"
+
+
+def run_script(tmp_path, rules, rows):
+    """ Runs the script on the rules and CSV rows, returns the rows of the CSV report """
+    rules_json = tmp_path / "rules.json"
+    rules_json.write_text(json.dumps(rules))
+
+    input_csv = tmp_path / "input.csv"
+    with input_csv.open("w", newline="") as fh:
+        csv.writer(fh).writerows(rows)
+
+    output_csv = tmp_path / "errors.csv"
+    subprocess.run([sys.executable, str(SCRIPT), "-r", str(rules_json), "-i", str(input_csv), "-o", str(output_csv)],
+                   check=True, capture_output=True, cwd=tmp_path, env={"PYTHONPATH": str(ROOT)})
+
+    with output_csv.open(newline="") as fh:
+        return list(csv.DictReader(fh))
+
+
+def test_report_row_column(tmp_path):
+    """ Errors of a field named row do not replace the row number in the report """
+    rules = {
+        "row": {"type": "integer", "max": 5},
+        "age": {"type": "integer", "nullable": True, "max": 120}
+    }
+    rows = [["row", "age"], ["1", "10"], ["10", "200"]]
+
+    assert run_script(tmp_path, rules, rows) == [{"row": "2", "age": "['max value is 120']"}]